@@ -41,6 +41,12 @@ Example:
             )
         ]
         generator.send(detections)
+
+        # Trusted fast path, from arrays of shape (N, 3)
+        positions = numpy.array([[0, 1, 0], [0, 1, 0], [0, 1, 0]])
+        directions = numpy.array([[0, 1, 0], [0, 1, 0], [0, 1, 0]])
+        generator.send_raw(["0", "1", "2"], positions, directions)
+
         data, _ = generator.get()
         if data:
             print(data)
@@ -48,11 +54,26 @@ Example:
             print("Timed out reading stream")
 """
 
-from datetime import datetime
+import time
 from typing import List, Tuple
 
+import numpy as np
+
 from rrmsutils.models.engagementanalytics.detection import Detection, Frame
-from rrmsutils.utils.redisclient import RedisClient
+from rrmsutils.models.point import Point3D
+from rrmsutils.utils.payload import JSON, decode_payload, encode_frame_values, encode_payload
+from rrmsutils.utils.points import as_points
+from rrmsutils.utils.streamwriter import DROP_OLDEST
+from rrmsutils.utils.timestamp import SecondFormatter
+from rrmsutils.utils.transport import RedisTransport, Transport
+
+_LOCAL_SECONDS = SecondFormatter("%Y-%m-%d %H:%M:%S")
+
+
+def _now_timestamp() -> str:
+    """Formats the current local time as "%Y-%m-%d %H:%M:%S.%f", formatting the date and time once per second"""
+    second, micro = divmod(time.time_ns() // 1000, 1000000)
+    return f"{_LOCAL_SECONDS.format(second)}.{micro:06d}"
 
 
 class DirectionSchemaGenerator():
@@ -61,7 +82,9 @@ class DirectionSchemaGenerator():
     and interact with a Redis stream for storing and retrieving frame data.
     """
 
-    def __init__(self, redis_stream: str, redis_port: int = 6379, redis_host: str = "localhost", camera_id: str = None, resolution: tuple = (0, 0)):
+    def __init__(self, redis_stream: str, redis_port: int = 6379, redis_host: str = "localhost", camera_id: str = None, resolution: tuple = (0, 0),
+                 encoding: str = JSON, compression: str = None, compression_threshold: int = 1024,
+                 buffer_size: int = 0, buffer_policy: str = DROP_OLDEST, transport: Transport = None):
         """
         Initializes the DirectionSchemaGenerator instance.
         Args:
@@ -70,6 +93,21 @@ class DirectionSchemaGenerator():
             redis_host (str, optional): The hostname of the Redis server. Defaults to "localhost".
             camera_id (str, optional): The ID of the camera. Defaults to None.
             resolution (tuple, optional): The resolution of the camera as a tuple (width, height). Defaults to (0, 0).
+            encoding (str, optional): The payload encoding used by `send`, either "json" or "binary".
+                                      `get` detects the encoding automatically. Defaults to "json".
+            compression (str, optional): Compress payloads sent with "zlib", "zstd" or "lz4". `get` decompresses
+                                         automatically. Defaults to None (no compression).
+            compression_threshold (int, optional): Payloads smaller than this number of bytes are sent uncompressed.
+                                                   Defaults to 1024.
+            buffer_size (int, optional): When greater than zero, `send` queues frames in a buffer of this size and a
+                                         background thread writes them to Redis in pipelined batches, so `send` never
+                                         waits on Redis. Call `close` to flush the buffer. Defaults to 0 (unbuffered).
+            buffer_policy (str, optional): What to do when the buffer is full, either "drop_oldest" or "block".
+                                           Defaults to "drop_oldest".
+            transport (Transport, optional): The transport used to move frames between producer and consumer, for
+                                             example a `QueueTransport` or `SharedMemoryTransport` for co-located
+                                             pipelines. The Redis and buffer arguments are ignored when it is given.
+                                             Defaults to None (Redis stream).
         """
 
         self.__camera_id = camera_id
@@ -77,11 +115,31 @@ class DirectionSchemaGenerator():
         self.__redis_stream = redis_stream
         self.__redis_port = redis_port
         self.__redis_host = redis_host
+        self.__encoding = encoding
+        self.__compression = compression
+        self.__compression_threshold = compression_threshold
         self.__frame_counter = 0
 
-        self.__redis = RedisClient(self.__redis_host, self.__redis_port)
+        self.__transport = transport or RedisTransport(self.__redis_stream, self.__redis_port, self.__redis_host,
+                                                       buffer_size=buffer_size, buffer_policy=buffer_policy)
 
-    def send(self, detections: List[Detection], frame_id: str = None, timestamp: str = None, maxlen: int = 1000) -> bool:
+    def __frame_header(self, frame_id, timestamp) -> tuple:
+        fid = frame_id
+        camera = self.__camera_id
+        timestamp_str = timestamp
+        if not fid:
+            fid = self.__frame_counter
+            self.__frame_counter += 1
+
+        if not camera:
+            camera = "camera"
+
+        if not timestamp_str:
+            timestamp_str = _now_timestamp()
+
+        return fid, camera, timestamp_str
+
+    def send(self, detections: List[Detection], frame_id: str = None, timestamp: str = None, maxlen: int = 1000, retention: float = None) -> bool:
         """
         Sends detection data to a Redis stream.
 
@@ -91,24 +149,14 @@ class DirectionSchemaGenerator():
             timestamp (str, optional): The timestamp of the frame. If not provided, the current time will be used. Defaults to None.
             maxlen (int, optional): The maximum number of entries to keep in the Redis stream.
                                     Older entries will be trimmed approximately if the stream exceeds this length. Defaults to 1000.
+            retention (float, optional): When set, entries older than this number of seconds are trimmed instead,
+                                         keeping the same time window regardless of the frame rate. Defaults to None.
 
         Returns:
-            bool: True if the data was successfully written to the Redis stream, False otherwise.
+            bool: True if the data was successfully written (or queued, when buffered) to the Redis stream, False otherwise.
         """
 
-        fid = frame_id
-        camera = self.__camera_id
-        timestamp_str = timestamp
-        if not fid:
-            fid = self.__frame_counter
-            self.__frame_counter += 1
-
-        if not camera:
-            camera = "camera"
-
-        if not timestamp_str:
-            now = datetime.now()
-            timestamp_str = now.strftime("%Y-%m-%d %H:%M:%S.%f")
+        fid, camera, timestamp_str = self.__frame_header(frame_id, timestamp)
 
         frame = Frame(
             id=fid,
@@ -125,9 +173,74 @@ class DirectionSchemaGenerator():
             print(f"Error validating data: {e}")
             return False
 
-        frame_str = frame.model_dump_json()
+        if self.__transport.serialize:
+            try:
+                fields = encode_payload(frame, self.__encoding, self.__compression, self.__compression_threshold)
+            except Exception as e:
+                print(f"Error encoding data: {e}")
+                return False
+        else:
+            fields = {"model": frame}
+
+        return self.__transport.write(fields, maxlen=maxlen, retention=retention)
+
+    def send_raw(self, objectids: list, positions, directions, frame_id: str = None, timestamp: str = None,
+                 maxlen: int = 1000, retention: float = None) -> bool:
+        """
+        Sends detection data to a Redis stream without building or validating the models.
+
+        The payload is serialized directly from the arrays and is byte-identical to the one `send` produces
+        for the same detections. The data is trusted: coordinates must be integers, as `Point3D` requires.
+
+        Args:
+            objectids (list): The object ID of every detection.
+            positions (np.ndarray): Array of shape (N, 3), or (N, 2) with z = 0, with the position of every detection.
+            directions (np.ndarray): Array of shape (N, 3), or (N, 2) with z = 0, with the direction of every detection.
+            frame_id (str, optional): The frame ID. If not provided, it will use the internal frame counter. Defaults to None.
+            timestamp (str, optional): The timestamp of the frame. If not provided, the current time will be used. Defaults to None.
+            maxlen (int, optional): The maximum number of entries to keep in the Redis stream.
+                                    Older entries will be trimmed approximately if the stream exceeds this length. Defaults to 1000.
+            retention (float, optional): When set, entries older than this number of seconds are trimmed instead,
+                                         keeping the same time window regardless of the frame rate. Defaults to None.
+
+        Returns:
+            bool: True if the data was successfully written (or queued, when buffered) to the Redis stream, False otherwise.
+        """
+
+        fid, camera, timestamp_str = self.__frame_header(frame_id, timestamp)
+
+        count = len(objectids)
+        positions = as_points(positions)
+        directions = as_points(directions)
+        if len(positions) != count or len(directions) != count:
+            print(f"Error encoding data: {count} object IDs, {len(positions)} positions and "
+                  f"{len(directions)} directions")
+            return False
+
+        coordinates = np.zeros((count, 6), dtype=np.int64)
+        coordinates[:, :positions.shape[1]] = positions
+        coordinates[:, 3:3 + directions.shape[1]] = directions
+
+        if not self.__transport.serialize:
+            detections = [
+                Detection.model_construct(objectid=objectid,
+                                          position=Point3D.model_construct(x=px, y=py, z=pz),
+                                          direction=Point3D.model_construct(x=dx, y=dy, z=dz))
+                for objectid, (px, py, pz, dx, dy, dz) in zip(objectids, coordinates.tolist())]
+            frame = Frame.model_construct(id=int(fid), cameraid=camera, timestamp=timestamp_str,
+                                          width=self.__resolution[0], height=self.__resolution[1],
+                                          detections=detections)
+            return self.__transport.write({"model": frame}, maxlen=maxlen, retention=retention)
+
+        try:
+            fields = encode_frame_values(fid, camera, timestamp_str, self.__resolution[0], self.__resolution[1],
+                                         objectids, coordinates, self.__encoding, self.__compression,
+                                         self.__compression_threshold)
+        except Exception as e:
+            print(f"Error encoding data: {e}")
+            return False
 
-        return self.__redis.write_to_stream(self.__redis_stream, {"data": frame_str}, maxlen=maxlen)
+        return self.__transport.write(fields, maxlen=maxlen, retention=retention)
 
     def get(self, block: int = 5000, last_id='$') -> Tuple[Frame, str]:
         """
@@ -139,19 +252,26 @@ class DirectionSchemaGenerator():
             Tuple[Frame, str]: A tuple containing the retrieved frame and the ID of the last message. If no detection is found, returns (None, last_id).
         """
 
-        detection, last_id = self.__redis.read_from_stream(
-            stream=self.__redis_stream, count=1, block=block, last_id=last_id)
+        data, last_id = self.__transport.read(block=block, last_id=last_id)
 
-        if not detection or len(detection) == 0:
+        if data is None:
             return None, last_id
 
-        _, data = detection[0][1][0]
+        if "model" in data:
+            return data["model"], last_id
 
         frame = None
         try:
-            frame = Frame.model_validate_json(data['data'])
+            frame = decode_payload(data, Frame)
         except Exception as e:
             print(f"Error reading from stream {self.__redis_stream}: {e}")
             return None, last_id
 
         return frame, last_id
+
+    def close(self):
+        """
+        Flushes any buffered data and releases the transport.
+        """
+
+        self.__transport.close()
@@ -47,12 +47,32 @@ Example usage:
     generator.send(heatmap)
     data, _ = generator.get()
     print(data)
+
+In delta mode the generator gives every blob a stable ID, matching each blob to the nearest blob
+of the previous update, and only publishes the blobs that were added, removed or changed. A full
+keyframe is published every `keyframe_interval` updates. `get` detects delta entries on its own
+and rebuilds the full heatmap. The rebuilt heatmap keeps blobs in the order they first appeared,
+as `IdentifiedBlob` models carrying their stable ID.
+A consumer that starts reading mid-stream, or misses an entry, returns None until the next keyframe.
+Pass the returned ID back to `get` so no entry is skipped.
+::
+
+    producer = HeatmapSchemaGenerator("heatmap", delta=True, keyframe_interval=30)
+    producer.send(heatmap)
+
+    consumer = HeatmapSchemaGenerator("heatmap")
+    heatmap, last_id = consumer.get(last_id="0")
+    heatmap, last_id = consumer.get(last_id=last_id)
 """
 
 from typing import Tuple
 
-from rrmsutils.models.heatmap import Heatmap
-from rrmsutils.utils.redisclient import RedisClient
+import numpy as np
+
+from rrmsutils.models.heatmap import Heatmap, HeatmapDelta
+from rrmsutils.utils.payload import JSON, HeatmapDeltaDecoder, decode_payload, encode_payload, is_heatmap_delta
+from rrmsutils.utils.streamwriter import DROP_OLDEST
+from rrmsutils.utils.transport import RedisTransport, Transport
 
 
 class HeatmapSchemaGenerator():
@@ -60,7 +80,10 @@ class HeatmapSchemaGenerator():
     A class to generate and manage heatmap schemas, and interact with a Redis stream.
     """
 
-    def __init__(self, redis_stream: str, redis_port: int = 6379, redis_host: str = "localhost"):
+    def __init__(self, redis_stream: str, redis_port: int = 6379, redis_host: str = "localhost", encoding: str = JSON,
+                 compression: str = None, compression_threshold: int = 1024,
+                 buffer_size: int = 0, buffer_policy: str = DROP_OLDEST, transport: Transport = None,
+                 delta: bool = False, keyframe_interval: int = 30, match_distance: float = None):
         """
         Initializes the HeatmapSchemaGenerator with the specified Redis stream, port, and host.
 
@@ -68,24 +91,152 @@ class HeatmapSchemaGenerator():
             redis_stream (str): The name of the Redis stream to connect to.
             redis_port (int, optional): The port number of the Redis server. Defaults to 6379.
             redis_host (str, optional): The hostname of the Redis server. Defaults to "localhost".
+            encoding (str, optional): The payload encoding used by `send`, either "json" or "binary".
+                                      `get` detects the encoding automatically. Defaults to "json".
+            compression (str, optional): Compress payloads sent with "zlib", "zstd" or "lz4". `get` decompresses
+                                         automatically. Defaults to None (no compression).
+            compression_threshold (int, optional): Payloads smaller than this number of bytes are sent uncompressed.
+                                                   Defaults to 1024.
+            buffer_size (int, optional): When greater than zero, `send` queues heatmaps in a buffer of this size and a
+                                         background thread writes them to Redis in pipelined batches, so `send` never
+                                         waits on Redis. Call `close` to flush the buffer. Defaults to 0 (unbuffered).
+            buffer_policy (str, optional): What to do when the buffer is full, either "drop_oldest" or "block".
+                                           Defaults to "drop_oldest".
+            transport (Transport, optional): The transport used to move heatmaps between producer and consumer, for
+                                             example a `QueueTransport` or `SharedMemoryTransport` for co-located
+                                             pipelines. The Redis and buffer arguments are ignored when it is given.
+                                             Defaults to None (Redis stream).
+            delta (bool, optional): Make `send` publish only the blobs that changed since the previous update.
+                                    Defaults to False.
+            keyframe_interval (int, optional): In delta mode, publish the full heatmap every this number of updates.
+                                               Defaults to 30.
+            match_distance (float, optional): In delta mode, the maximum distance for a blob to keep the ID of a
+                                              blob of the previous update. Defaults to None (the radius of the
+                                              previous blob).
         """
 
         self.__redis_stream = redis_stream
         self.__redis_port = redis_port
         self.__redis_host = redis_host
+        self.__encoding = encoding
+        self.__compression = compression
+        self.__compression_threshold = compression_threshold
+
+        self.__transport = transport or RedisTransport(self.__redis_stream, self.__redis_port, self.__redis_host,
+                                                       buffer_size=buffer_size, buffer_policy=buffer_policy)
+
+        # Producer state: the published blobs by ID, in the order they appeared
+        self.__delta = delta
+        self.__keyframe_interval = keyframe_interval
+        self.__match_distance = match_distance
+        self.__blobs = {}
+        self.__next_id = 0
+        self.__sequence = 0
+        self.__since_keyframe = keyframe_interval
+
+        # Consumer state: the heatmap rebuilt from deltas
+        self.__decoder = HeatmapDeltaDecoder()
+
+    def force_keyframe(self):
+        """
+        Makes the next delta mode update a keyframe, for example when a new consumer starts reading.
+        """
+
+        self.__since_keyframe = self.__keyframe_interval
+
+    def __match(self, values: list) -> list:
+        """Gets the ID of the previous blob matched to every blob, or None for new blobs"""
+        matches = [None] * len(values)
+        if not values or not self.__blobs:
+            return matches
+
+        # Most blobs are unchanged between updates, pair those by value first
+        unchanged = {}
+        for blob_id, value in self.__blobs.items():
+            unchanged.setdefault(value, []).append(blob_id)
+        used = set()
+        for i, value in enumerate(values):
+            blob_ids = unchanged.get(value)
+            if blob_ids:
+                matches[i] = blob_ids.pop()
+                used.add(matches[i])
+
+        pending = [i for i, match in enumerate(matches) if match is None]
+        ids = [blob_id for blob_id in self.__blobs if blob_id not in used]
+        if not pending or not ids:
+            return matches
+
+        previous = np.array([self.__blobs[blob_id] for blob_id in ids], dtype=np.float64)
+        current = np.array([values[i] for i in pending], dtype=np.float64)
 
-        self.__redis = RedisClient(self.__redis_host, self.__redis_port)
+        dx = current[:, 0, None] - previous[None, :, 0]
+        dy = current[:, 1, None] - previous[None, :, 1]
+        distances = dx * dx + dy * dy
+        limits = previous[:, 3] ** 2 if self.__match_distance is None else self.__match_distance ** 2
+        rows, columns = np.nonzero(distances <= limits)
 
-    def send(self, heatmap: Heatmap,  maxlen: int = 1000) -> bool:
+        # Greedily pair the closest blobs first
+        order = np.argsort(distances[rows, columns], kind="stable")
+        for row, column in zip(rows[order].tolist(), columns[order].tolist()):
+            if matches[pending[row]] is None and ids[column] not in used:
+                matches[pending[row]] = ids[column]
+                used.add(ids[column])
+
+        return matches
+
+    def __make_delta(self, heatmap: Heatmap) -> HeatmapDelta:
+        """Assigns blob IDs and computes the delta against the previous update"""
+        self.__sequence += 1
+        self.__since_keyframe += 1
+        keyframe = self.__since_keyframe >= self.__keyframe_interval
+        if keyframe:
+            self.__since_keyframe = 0
+
+        # Blobs are kept as value tuples, so heatmaps modified in place between sends are still compared
+        values = [(blob.position.x, blob.position.y, blob.intensity, blob.radius) for blob in heatmap.heatmap]
+        blobs = {}
+        added = []
+        changed = []
+        for value, blob_id in zip(values, self.__match(values)):
+            if blob_id is None:
+                blob_id = self.__next_id
+                self.__next_id += 1
+                added.append(blob_id)
+            elif value != self.__blobs[blob_id]:
+                changed.append(blob_id)
+            blobs[blob_id] = value
+
+        removed = [blob_id for blob_id in self.__blobs if blob_id not in blobs]
+
+        # Keep surviving blobs in place and new ones at the end, the order consumers rebuild
+        self.__blobs = {blob_id: blobs[blob_id] for blob_id in self.__blobs if blob_id in blobs}
+        self.__blobs.update((blob_id, blobs[blob_id]) for blob_id in added)
+
+        # Validating the whole delta at once is much faster than constructing every blob model
+        def identified(blob_ids):
+            return [{"id": blob_id, "position": {"x": x, "y": y}, "intensity": intensity, "radius": radius}
+                    for blob_id in blob_ids for x, y, intensity, radius in (self.__blobs[blob_id],)]
+
+        if keyframe:
+            return HeatmapDelta.model_validate({"sequence": self.__sequence, "keyframe": True,
+                                                "added": identified(self.__blobs), "changed": [], "removed": []})
+
+        return HeatmapDelta.model_validate({"sequence": self.__sequence, "keyframe": False,
+                                            "added": identified(added), "changed": identified(changed),
+                                            "removed": removed})
+
+    def send(self, heatmap: Heatmap,  maxlen: int = 1000, retention: float = None) -> bool:
         """
-        Sends a heatmap to a Redis stream.
+        Sends a heatmap to a Redis stream. In delta mode only the changes since the previous heatmap are sent.
 
         Args:
             heatmap (Heatmap): The heatmap object to be sent.
             maxlen (int, optional): The maximum number of entries to keep in the Redis stream.
                                     Older entries will be trimmed approximately if the stream exceeds this length. Defaults to 1000.
+            retention (float, optional): When set, entries older than this number of seconds are trimmed instead,
+                                         keeping the same time window regardless of the frame rate. Defaults to None.
         Returns:
-            bool: True if the heatmap was successfully written to the Redis stream, False otherwise.
+            bool: True if the heatmap was successfully written (or queued, when buffered) to the Redis stream, False otherwise.
         """
 
         try:
@@ -94,35 +245,69 @@ class HeatmapSchemaGenerator():
             print(f"Error validating data: {e}")
             return False
 
-        heatmap_str = heatmap.model_dump_json()
+        model = self.__make_delta(heatmap) if self.__delta else heatmap
+
+        if self.__transport.serialize:
+            try:
+                fields = encode_payload(model, self.__encoding, self.__compression, self.__compression_threshold)
+            except Exception as e:
+                print(f"Error encoding data: {e}")
+                self.force_keyframe()
+                return False
+            if self.__delta:
+                fields["kind"] = "delta"
+        else:
+            fields = {"model": model}
 
-        return self.__redis.write_to_stream(self.__redis_stream, {"data": heatmap_str}, maxlen=maxlen)
+        written = self.__transport.write(fields, maxlen=maxlen, retention=retention)
+        if self.__delta and not written:
+            # Consumers will see the gap in the sequence, resynchronize them as soon as possible
+            self.force_keyframe()
+        return written
 
     def get(self, block: int = 5000, last_id='$') -> Tuple[Heatmap, str]:
         """
-        Retrieves a heatmap from the Redis stream.
+        Retrieves a heatmap from the Redis stream. Delta entries are applied to the heatmap rebuilt from the
+        previous entries.
 
         Args:
             block (int, optional): The maximum amount of time (in milliseconds) to block while waiting for data. Defaults to 5000.
             last_id (str, optional): The ID of the last processed entry in the stream. Defaults to '$', which means the latest entry.
         Returns:
             Tuple[Heatmap, str]: A tuple containing the Heatmap object and the ID of the last processed entry.
-                                 If no heatmap is retrieved, returns (None, last_id).
+                                 If no heatmap is retrieved, or a delta cannot be applied until the next keyframe,
+                                 returns (None, last_id). Heatmaps rebuilt from deltas share their blobs with the
+                                 following heatmaps, so they must not be modified.
         """
 
-        heatmap, last_id = self.__redis.read_from_stream(
-            stream=self.__redis_stream, count=1, block=block, last_id=last_id)
+        data, last_id = self.__transport.read(block=block, last_id=last_id)
 
-        if not heatmap or len(heatmap) == 0:
+        if data is None:
             return None, last_id
 
-        _, data = heatmap[0][1][0]
+        if "model" in data:
+            model = data["model"]
+            if isinstance(model, HeatmapDelta):
+                return self.__decoder.apply(model), last_id
+            return model, last_id
+
+        model_type = HeatmapDelta if is_heatmap_delta(data) else Heatmap
 
         heatmap = None
         try:
-            heatmap = Heatmap.model_validate_json(data['data'])
+            heatmap = decode_payload(data, model_type)
         except Exception as e:
             print(f"Error reading from stream {self.__redis_stream}: {e}")
             return None, last_id
 
+        if model_type is HeatmapDelta:
+            return self.__decoder.apply(heatmap), last_id
+
         return heatmap, last_id
+
+    def close(self):
+        """
+        Flushes any buffered data and releases the transport.
+        """
+
+        self.__transport.close()
@@ -0,0 +1,296 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module defines columnar representations of the engagement analytics detections.
+
+A `Frame` holds one `Detection` model, with two `Point3D` models, per detected object. That
+is convenient for single frames but expensive when buffering time windows of frames. The
+columnar types store the same data in NumPy arrays instead:
+
+The DetectionArray holds the object IDs of N detections and their coordinates as an (N, 6)
+int32 array with px, py, pz, dx, dy, dz per row, the same layout as the binary payload.
+`positions` and `directions` are (N, 3) views of it.
+
+The FrameBatch holds many frames: one entry per frame for the frame fields, and the
+detections of all the frames in a single DetectionArray, with offsets marking where each
+frame starts. Batches can be built from `Frame` models or decoded directly from stream
+payloads, without creating any model. Conversions to and from `Frame` are lossless for
+coordinates within the int32 range, which is also the range of the binary payload.
+
+Example usage:
+::
+
+    from rrmsutils.models.engagementanalytics.framebatch import FrameBatch
+
+    entries, last_id = redis_client.read_from_stream("detection", count=500, last_id=last_id)
+    batch = FrameBatch.from_entries(entries)
+
+    for i in range(len(batch)):
+        detections = batch.detections(i)
+        print(batch.timestamps[i], detections.objectids, detections.positions)
+
+    frames = batch.to_frames()
+"""
+
+import json
+import sys
+from typing import List
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.detection import Detection, Frame
+from rrmsutils.utils.payload import BINARY_FORMAT, read_payload, unpack_frame
+
+
+class DetectionArray:
+    """
+    Columnar detections.
+
+    Attributes:
+        objectids (list): The object ID of every detection.
+        coordinates (np.ndarray): Array of shape (N, 6) with px, py, pz, dx, dy, dz for every detection.
+    """
+
+    def __init__(self, objectids: list, coordinates: np.ndarray):
+        """
+        Initializes the array.
+
+        Args:
+            objectids (list): The object ID of every detection.
+            coordinates (np.ndarray): Array of shape (N, 6) with px, py, pz, dx, dy, dz for every detection.
+        """
+        self.objectids = objectids
+        self.coordinates = np.asarray(coordinates, dtype=np.int32).reshape(len(objectids), 6)
+
+    @classmethod
+    def from_arrays(cls, objectids: list, positions: np.ndarray, directions: np.ndarray) -> "DetectionArray":
+        """Create the array from separate position and direction arrays
+
+        Args:
+            objectids (list): The object ID of every detection.
+            positions (np.ndarray): Array of shape (N, 3) with the position of every detection.
+            directions (np.ndarray): Array of shape (N, 3) with the direction of every detection.
+
+        Returns:
+            DetectionArray: The detections.
+        """
+        return cls(list(objectids), np.hstack((np.reshape(positions, (-1, 3)), np.reshape(directions, (-1, 3)))))
+
+    @classmethod
+    def from_detections(cls, detections: List[Detection]) -> "DetectionArray":
+        """Create the array from Detection models
+
+        Args:
+            detections (List[Detection]): The detections.
+
+        Returns:
+            DetectionArray: The detections.
+        """
+        coordinates = []
+        for detection in detections:
+            position = detection.position
+            direction = detection.direction
+            coordinates.extend((position.x, position.y, position.z, direction.x, direction.y, direction.z))
+
+        return cls([detection.objectid for detection in detections], coordinates)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """View of shape (N, 3) with the position of every detection"""
+        return self.coordinates[:, :3]
+
+    @property
+    def directions(self) -> np.ndarray:
+        """View of shape (N, 3) with the direction of every detection"""
+        return self.coordinates[:, 3:]
+
+    def __len__(self) -> int:
+        return len(self.objectids)
+
+    def to_detections(self) -> List[Detection]:
+        """Convert the array into Detection models
+
+        Returns:
+            List[Detection]: The detections.
+        """
+        return [Detection.model_validate({"objectid": objectid,
+                                          "position": {"x": px, "y": py, "z": pz},
+                                          "direction": {"x": dx, "y": dy, "z": dz}})
+                for objectid, (px, py, pz, dx, dy, dz) in zip(self.objectids, self.coordinates.tolist())]
+
+
+class FrameBatch:
+    """
+    Columnar batch of frames.
+
+    Attributes:
+        ids (np.ndarray): The ID of every frame.
+        cameraids (list): The camera ID of every frame.
+        timestamps (list): The timestamp of every frame.
+        widths (np.ndarray): The width of every frame.
+        heights (np.ndarray): The height of every frame.
+        offsets (np.ndarray): Array of shape (F + 1,). The detections of frame i are rows offsets[i] to
+                              offsets[i + 1] of all_detections.
+        all_detections (DetectionArray): The detections of every frame, in frame order.
+    """
+
+    def __init__(self, ids, cameraids: list, timestamps: list, widths, heights, offsets,
+                 all_detections: DetectionArray):
+        """
+        Initializes the batch.
+
+        Args:
+            ids (list | np.ndarray): The ID of every frame.
+            cameraids (list): The camera ID of every frame.
+            timestamps (list): The timestamp of every frame.
+            widths (list | np.ndarray): The width of every frame.
+            heights (list | np.ndarray): The height of every frame.
+            offsets (list | np.ndarray): The index of the first detection of every frame, followed by the total
+                                         number of detections.
+            all_detections (DetectionArray): The detections of every frame, in frame order.
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.cameraids = cameraids
+        self.timestamps = timestamps
+        self.widths = np.asarray(widths, dtype=np.int64)
+        self.heights = np.asarray(heights, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.all_detections = all_detections
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the batch, including the strings"""
+        strings = self.cameraids + self.timestamps + self.all_detections.objectids
+        return (self.ids.nbytes + self.widths.nbytes + self.heights.nbytes + self.offsets.nbytes +
+                self.all_detections.coordinates.nbytes + sum(sys.getsizeof(string) for string in set(strings)) +
+                sys.getsizeof(self.cameraids) + sys.getsizeof(self.timestamps) +
+                sys.getsizeof(self.all_detections.objectids))
+
+    @classmethod
+    def from_frames(cls, frames: List[Frame]) -> "FrameBatch":
+        """Create the batch from Frame models
+
+        Args:
+            frames (List[Frame]): The frames.
+
+        Returns:
+            FrameBatch: The batch.
+        """
+        offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+        np.cumsum([len(frame.detections) for frame in frames], out=offsets[1:])
+
+        return cls([frame.id for frame in frames], [frame.cameraid for frame in frames],
+                   [frame.timestamp for frame in frames], [frame.width for frame in frames],
+                   [frame.height for frame in frames], offsets,
+                   DetectionArray.from_detections([detection for frame in frames for detection in frame.detections]))
+
+    @classmethod
+    def from_payloads(cls, payloads: list) -> "FrameBatch":
+        """Decode the batch directly from stream entry fields written by `encode_payload`, in either encoding
+
+        Args:
+            payloads (list): The fields of every stream entry, either decoded or raw.
+
+        Raises:
+            ValueError: If a format marker or compression is unknown.
+
+        Returns:
+            FrameBatch: The batch.
+        """
+        count = len(payloads)
+        ids = np.zeros(count, dtype=np.int64)
+        widths = np.zeros(count, dtype=np.int64)
+        heights = np.zeros(count, dtype=np.int64)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        cameraids = []
+        timestamps = []
+        objectids = []
+        coordinates = []
+
+        intern = sys.intern
+        for i, fields in enumerate(payloads):
+            data, payload_format = read_payload(fields)
+
+            if payload_format == BINARY_FORMAT:
+                ids[i], cameraid, timestamp, widths[i], heights[i], frame_objectids, offset = unpack_frame(data)
+                coordinates.append(np.frombuffer(data, dtype="<i4", count=6 * len(frame_objectids), offset=offset))
+            elif payload_format is None:
+                frame = json.loads(data)
+                ids[i], cameraid, timestamp = frame["id"], frame["cameraid"], frame["timestamp"]
+                widths[i], heights[i] = frame["width"], frame["height"]
+                frame_objectids = []
+                values = []
+                for detection in frame["detections"]:
+                    position = detection["position"]
+                    direction = detection["direction"]
+                    frame_objectids.append(detection["objectid"])
+                    values.extend((position["x"], position["y"], position.get("z", 0),
+                                   direction["x"], direction["y"], direction.get("z", 0)))
+                coordinates.append(np.array(values, dtype=np.int32))
+            else:
+                raise ValueError(f"Unsupported payload format {payload_format}")
+
+            # Object and camera IDs repeat across frames, keep a single copy of each string
+            cameraids.append(intern(cameraid))
+            timestamps.append(timestamp)
+            objectids.extend(intern(objectid) for objectid in frame_objectids)
+            offsets[i + 1] = offsets[i] + len(frame_objectids)
+
+        all_coordinates = np.concatenate(coordinates) if coordinates else np.zeros(0, dtype=np.int32)
+        return cls(ids, cameraids, timestamps, widths, heights, offsets, DetectionArray(objectids, all_coordinates))
+
+    @classmethod
+    def from_entries(cls, entries: list) -> "FrameBatch":
+        """Decode the batch from the entries read from Redis streams
+
+        Args:
+            entries (list): The entries as returned by `RedisClient.read_from_stream`.
+
+        Returns:
+            FrameBatch: The batch.
+        """
+        return cls.from_payloads([fields for _, stream_entries in entries for _, fields in stream_entries])
+
+    def detections(self, index: int) -> DetectionArray:
+        """Get the detections of a frame
+
+        Args:
+            index (int): The frame index in the batch.
+
+        Returns:
+            DetectionArray: The detections, sharing the coordinates of the batch.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return DetectionArray(self.all_detections.objectids[start:end], self.all_detections.coordinates[start:end])
+
+    def frame(self, index: int) -> Frame:
+        """Convert a frame of the batch into a Frame model
+
+        Args:
+            index (int): The frame index in the batch.
+
+        Returns:
+            Frame: The frame.
+        """
+        return Frame(id=int(self.ids[index]), cameraid=self.cameraids[index], timestamp=self.timestamps[index],
+                     width=int(self.widths[index]), height=int(self.heights[index]),
+                     detections=self.detections(index).to_detections())
+
+    def to_frames(self) -> List[Frame]:
+        """Convert the batch into Frame models
+
+        Returns:
+            List[Frame]: The frames.
+        """
+        return [self.frame(index) for index in range(len(self))]
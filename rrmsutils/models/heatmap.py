@@ -15,6 +15,8 @@ Classes:
     Blob: A model representing a heatmap spot (or blob) with a specific position,
     intensity, and radius.
     Heatmap: A model representing a heatmap data structure.
+    IdentifiedBlob: A blob with a stable ID, used by heatmap deltas.
+    HeatmapDelta: A model representing the changes of a heatmap since the previous update.
 
 Example usage:
 ::
@@ -60,3 +62,35 @@ class Heatmap(BaseModel):
     """
 
     heatmap: List[Blob]
+
+
+class IdentifiedBlob(Blob):
+    """
+    IdentifiedBlob represents a blob with an ID that stays the same while the blob moves across updates.
+
+    Attributes:
+        id (int): The blob ID.
+    """
+
+    id: int
+
+
+class HeatmapDelta(BaseModel):
+    """
+    HeatmapDelta model representing the changes of a heatmap since the previous update.
+
+    Keyframes carry every blob in `added` and replace the heatmap instead of updating it.
+
+    Attributes:
+        sequence (int): The update number. A consumer can only apply a delta on top of the previous sequence.
+        keyframe (bool): Whether the delta holds the full heatmap.
+        added (List[IdentifiedBlob]): The blobs that appeared.
+        changed (List[IdentifiedBlob]): The new values of the blobs that changed.
+        removed (List[int]): The IDs of the blobs that disappeared.
+    """
+
+    sequence: int
+    keyframe: bool
+    added: List[IdentifiedBlob]
+    changed: List[IdentifiedBlob]
+    removed: List[int]
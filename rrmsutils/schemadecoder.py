@@ -0,0 +1,187 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a decoder for the Metropolis minimal schema messages produced by
+`rrmsutils.schemagenerator.SchemaGenerator`.
+
+Every object of a message is a ``"x1|y1|x2|y2|label"`` string. The SchemaDecoder parses the
+objects of one or many messages into a single NumPy array of boxes, and interns the labels
+into integer IDs so consumers never handle per-object strings. The vocabulary can be seeded
+with the labels given to the generator, in which case label IDs equal the class IDs.
+
+Classes:
+    DecodedFrames: The frames of a batch, with the boxes and label IDs of all of them stored
+        in flat arrays.
+    SchemaDecoder: Decodes messages, batches of messages or stream entries.
+
+Example usage:
+::
+
+    from rrmsutils.schemadecoder import SchemaDecoder
+
+    decoder = SchemaDecoder(labels=["person", "car"])
+
+    frame, boxes, label_ids = decoder.decode(message)
+
+    entries, last_id = redis_client.read_from_stream("owl", count=100, last_id=last_id)
+    frames = decoder.decode_entries(entries)
+    for i in range(len(frames)):
+        boxes, label_ids = frames.objects(i)
+"""
+
+import json
+from typing import Tuple
+
+import numpy as np
+
+
+class DecodedFrames:
+    """Decoded frames with flat object arrays
+
+    Attributes:
+        frames (list): The message of every frame, as a dictionary without the "objects" field.
+        boxes (np.ndarray): Array of shape (M, 4) with the (x1, y1, x2, y2) box of every object of every frame.
+        label_ids (np.ndarray): Array of shape (M,) with the interned label of every object.
+        offsets (np.ndarray): Array of shape (N + 1,). The objects of frame i are rows offsets[i] to offsets[i + 1].
+        entry_ids (list): The stream entry ID of every frame, when decoded from a stream. Defaults to None.
+    """
+
+    def __init__(self, frames: list, boxes: np.ndarray, label_ids: np.ndarray, offsets: np.ndarray,
+                 entry_ids: list = None):
+        self.frames = frames
+        self.boxes = boxes
+        self.label_ids = label_ids
+        self.offsets = offsets
+        self.entry_ids = entry_ids
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def objects(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the objects of a frame
+
+        Args:
+            index (int): The frame index in the batch.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Views of the boxes and label IDs of the frame.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.boxes[start:end], self.label_ids[start:end]
+
+
+class SchemaDecoder:
+    """Metropolis minimal schema decoder
+    """
+
+    def __init__(self, labels: list = None, field: str = "metadata"):
+        """
+        Initializes the decoder.
+
+        Args:
+            labels (list, optional): Labels to intern first, so the ID of each one is its index in the list.
+                                     Defaults to None.
+            field (str, optional): The stream entry field holding the message. Defaults to "metadata".
+        """
+        self.__ids = {}
+        self.__vocab = []
+        self.__field = field
+        for label in labels or []:
+            self.label_id(label)
+
+    @property
+    def vocab(self) -> list:
+        """The interned labels, indexed by label ID"""
+        return self.__vocab
+
+    def label_id(self, label: str) -> int:
+        """Get the ID of a label, interning it if needed
+
+        Args:
+            label (str): The label.
+
+        Returns:
+            int: The label ID.
+        """
+        label_id = self.__ids.get(label)
+        if label_id is None:
+            label_id = len(self.__vocab)
+            self.__ids[label] = label_id
+            self.__vocab.append(label)
+        return label_id
+
+    def __parse(self, objects: list) -> Tuple[np.ndarray, np.ndarray]:
+        rows = [obj.split("|", 4) for obj in objects]
+        if any(len(row) != 5 for row in rows):
+            raise ValueError("Objects must have the x1|y1|x2|y2|label format")
+
+        boxes = np.array([value for row in rows for value in row[:4]], dtype=np.float64).reshape(-1, 4)
+
+        ids = self.__ids
+        label_id = self.label_id
+        label_ids = np.fromiter((ids[row[4]] if row[4] in ids else label_id(row[4]) for row in rows),
+                                dtype=np.int32, count=len(rows))
+        return boxes, label_ids
+
+    def decode(self, message) -> Tuple[dict, np.ndarray, np.ndarray]:
+        """Decode a single message
+
+        Args:
+            message (str | bytes): The JSON message.
+
+        Returns:
+            Tuple[dict, np.ndarray, np.ndarray]: The message without the "objects" field, the (N, 4) boxes
+                                                 and the (N,) label IDs.
+        """
+        frame = json.loads(message)
+        boxes, label_ids = self.__parse(frame.pop("objects", []))
+        return frame, boxes, label_ids
+
+    def decode_batch(self, messages: list, entry_ids: list = None) -> DecodedFrames:
+        """Decode many messages at once
+
+        Args:
+            messages (list): The JSON messages.
+            entry_ids (list, optional): The stream entry ID of every message. Defaults to None.
+
+        Returns:
+            DecodedFrames: The decoded frames.
+        """
+        frames = [json.loads(message) for message in messages]
+        objects = [frame.pop("objects", []) for frame in frames]
+
+        offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+        np.cumsum([len(frame_objects) for frame_objects in objects], out=offsets[1:])
+
+        boxes, label_ids = self.__parse([obj for frame_objects in objects for obj in frame_objects])
+        return DecodedFrames(frames, boxes, label_ids, offsets, entry_ids)
+
+    def decode_entries(self, entries: list) -> DecodedFrames:
+        """Decode the entries read from Redis streams
+
+        Args:
+            entries (list): The entries as returned by `RedisClient.read_from_stream`, with str or bytes fields.
+
+        Returns:
+            DecodedFrames: The decoded frames, with their entry IDs.
+        """
+        field = self.__field
+        messages = []
+        entry_ids = []
+        for _, stream_entries in entries:
+            for entry_id, fields in stream_entries:
+                message = fields.get(field)
+                if message is None:
+                    message = fields[field.encode()]
+                messages.append(message)
+                entry_ids.append(entry_id)
+
+        return self.decode_batch(messages, entry_ids)
@@ -14,9 +14,69 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import redis 
 import datetime 
 import json
+import time
+
+import numpy as np
+
+from rrmsutils.utils.redisclient import RedisClient
+from rrmsutils.utils.timestamp import SecondFormatter
+
+#Cached decimal strings of small non negative integers, indexed by value
+_INT_STRINGS = np.array([], dtype=object)
+_INT_STRINGS_MAX = 1 << 16
+
+_UTC_SECONDS = SecondFormatter("%Y-%m-%dT%H:%M:%S", utc=True)
+
+
+def _int_strings(size):
+    global _INT_STRINGS  # pylint: disable=global-statement
+    if size > len(_INT_STRINGS):
+        _INT_STRINGS = np.array([str(i) for i in range(max(size, 2 * len(_INT_STRINGS)))], dtype=object)
+    return _INT_STRINGS
+
+
+def _format_boxes(bboxes):
+    """
+    Formats every bounding box as "x1|y1|x2|y2", exactly as str() formats each value.
+
+    Args:
+        bboxes (np.ndarray): Array of shape (N, 4).
+
+    Returns:
+        list[str]: One string per box.
+    """
+    kind = bboxes.dtype.kind
+    if kind in "iuf" and len(bboxes) > 0:
+        #Integer values, and float values without fractional part, are looked up in a table of cached strings
+        if kind == "f":
+            integral = not np.signbit(bboxes).any() and bool((np.floor(bboxes) == bboxes).all())
+        else:
+            integral = bboxes.min() >= 0
+        if integral and bboxes.max() < _INT_STRINGS_MAX:
+            s = _int_strings(int(bboxes.max()) + 1)[bboxes.astype(np.intp)]
+            if kind == "f":
+                s = s + ".0"
+            return (s[:, 0] + "|" + s[:, 1] + "|" + s[:, 2] + "|" + s[:, 3]).tolist()
+
+    if bboxes.dtype == np.float64 or bboxes.dtype.kind in "iu":
+        #Python scalars print exactly like their NumPy counterparts for these types
+        rows = bboxes.tolist()
+    else:
+        rows = bboxes
+    return [f"{box[0]}|{box[1]}|{box[2]}|{box[3]}" for box in rows]
+
+
+def _utc_timestamp():
+    """
+    Returns the current UTC time formatted like datetime.datetime.utcnow().isoformat("T") + "Z",
+    formatting the date and time only once per second.
+    """
+    second, micro = divmod(round(time.time() * 1000000), 1000000)
+    if micro:
+        return f"{_UTC_SECONDS.format(second)}.{micro:06d}Z"
+    return _UTC_SECONDS.format(second) + "Z"
 
 class SchemaGenerator:
 
@@ -30,6 +90,10 @@ class SchemaGenerator:
             redis_stream (str): Redis Stream name to output metadata
             redis_host (str): Redis server host to connect to 
             redis_port (int): Port of redis server
+            labels (list[str]): Label of each class ID, used by generate
+            maxlen (int): Approximate maximum number of entries kept in the redis stream, None for unbounded. Defaults to 1000
+            retention (float): Time in seconds to keep entries in the redis stream, replaces maxlen if given
+            frame_id_start (int): ID given to the first frame when no frame ID is passed. Defaults to 0
 
         Returns:
             None
@@ -40,7 +104,10 @@ class SchemaGenerator:
         self.redis_port = kwargs.get("redis_port", None)
         self.redis_host = kwargs.get("redis_host", None)
         self.redis_connected = False
-        self.frame_counter = 0
+        self.maxlen = kwargs.get("maxlen", 1000)
+        self.retention = kwargs.get("retention", None)
+        self.frame_counter = kwargs.get("frame_id_start", 0)
+        self.set_labels(kwargs.get("labels", None))
 
         #If user supplied redis info then connect
         if self.redis_stream != None and self.redis_port != None and self.redis_stream!= None:
@@ -50,7 +117,7 @@ class SchemaGenerator:
 
     def connect_redis(self, host, port, stream):
         """
-        Connects object to a redis server. 
+        Connects object to a redis server. Generators connected to the same server share a connection pool.
 
         Args:
             host (str): Redis server host ex: "0.0.0.0"
@@ -61,9 +128,31 @@ class SchemaGenerator:
             none
         """
         self.redis_stream = stream 
-        self.redis_server = redis.Redis(host=host, port=port, decode_responses=True)
+        self.redis_client = RedisClient(host, port, shared_pool=True)
         self.redis_connected = True
 
+    @property
+    def redis_server(self):
+        """
+        The redis.Redis connection used by connect_redis, kept for callers that write to redis directly.
+        """
+        return self.redis_client._redis  # pylint: disable=protected-access
+
+    def set_labels(self, labels):
+        """
+        Sets the label of each class ID used by generate. The JSON encoding of every label is computed once here.
+
+        Args:
+            labels (list[str]): Label of each class ID, or None to use the class ID itself as label.
+
+        Returns:
+            none
+        """
+        self.labels = labels
+        self._label_suffixes = None
+        if labels is not None:
+            self._label_suffixes = np.array(["|" + json.dumps(str(label))[1:-1] + '"' for label in labels], dtype=object)
+
     def _gen_schema(self, objects, bboxes, frame_id=None):
         if frame_id is None:
             frame_id = self.frame_counter
@@ -86,23 +175,123 @@ class SchemaGenerator:
         frame_schema = json.dumps(frame_schema)
         return frame_schema
 
+    def _gen_schema_arrays(self, bboxes, class_ids, frame_id=None):
+        if frame_id is None:
+            frame_id = self.frame_counter
+            self.frame_counter+=1
+
+        bboxes = np.asarray(bboxes).reshape(-1, 4)
+        class_ids = np.asarray(class_ids).reshape(-1)
+        if len(class_ids) != len(bboxes):
+            raise Exception("class_ids and bboxes not the same length.")
+
+        if self._label_suffixes is not None:
+            suffixes = self._label_suffixes[self._label_indices(class_ids)].tolist()
+        else:
+            suffixes = ["|" + json.dumps(str(class_id))[1:-1] + '"' for class_id in class_ids.tolist()]
+
+        objects = ", ".join(['"' + box + suffix for box, suffix in zip(_format_boxes(bboxes), suffixes)])
+
+        #Same output as json.dumps in _gen_schema, without building the intermediate dict
+        return ('{"version": "4.0", "id": ' + json.dumps(frame_id) + ', "timestamp": "' + _utc_timestamp() +
+                '", "sensorId": ' + json.dumps(self.sensor_id) + ', "objects": [' + objects + '], "width": ' +
+                json.dumps(self.image_size[0]) + ', "height": ' + json.dumps(self.image_size[1]) + '}')
+
+    def _label_indices(self, class_ids):
+        """
+        Converts class IDs to indices of the labels given to set_labels. Float IDs with integer values, as many
+        detectors output, are accepted.
+
+        Raises:
+            ValueError: If a class ID is not an integer or has no label.
+        """
+        if class_ids.dtype.kind == "f" and not (np.floor(class_ids) == class_ids).all():
+            raise ValueError("class_ids must be integers.")
+        if class_ids.dtype.kind not in "iuf" and len(class_ids) > 0:
+            raise ValueError(f"class_ids must be integers, got {class_ids.dtype}.")
+
+        indices = class_ids.astype(np.intp)
+        if len(indices) > 0 and (indices.min() < 0 or indices.max() >= len(self._label_suffixes)):
+            raise ValueError(f"class_ids must be between 0 and {len(self._label_suffixes) - 1}.")
+        return indices
+
     def _redis_out(self, metadata):
-        self.redis_server.xadd(self.redis_stream, {"metadata":metadata})
+        if not self.redis_client.write_to_stream(self.redis_stream, {"metadata":metadata}, maxlen=self.maxlen, retention=self.retention):
+            raise RuntimeError(f"Error writing metadata to redis stream {self.redis_stream}")
     
-    def __call__(self, objects, bboxes):
+    def __call__(self, objects, bboxes, frame_id=None):
         """
         Converts list of objects and associated bounding boxes into metropolis minimal schema and outputs on a redis stream if available. 
 
         Args:
             objects (list[str]): Text to draw for each bounding box.
             bboxes (list[(int,int,int,int), ...]): List of bounding boxes. Each bounding box should be in this format (x1, y1, x2, y2) Where x1,y1 is the top left and x2,y2 is the bottom right coordinate of the bbox. 
+            frame_id (int): ID of the frame. Defaults to the next value of the frame counter
 
         Returns:
             out (str): A serialized json string with the metadata in Metropolis minimal schema. Will also write this to a redis stream if connected.
         """
-        out = self._gen_schema(objects, bboxes)
+        out = self._gen_schema(objects, bboxes, frame_id)
       
         if self.redis_connected:
             self._redis_out(out)
 
         return out 
+
+    def generate(self, bboxes, class_ids, frame_id=None):
+        """
+        Same as calling the object, but takes the detector output as NumPy arrays. Boxes are formatted in bulk and
+        labels are taken from the ones given to set_labels, so no per object string formatting or JSON encoding
+        is done in Python.
+
+        Args:
+            bboxes (np.ndarray): Array of shape (N, 4) with one (x1, y1, x2, y2) bounding box per row.
+            class_ids (np.ndarray): Array of shape (N,) with the class ID of each bounding box. Float IDs with
+                                    integer values are accepted. With labels, every ID must have a label.
+            frame_id (int): ID of the frame. Defaults to the next value of the frame counter
+
+        Returns:
+            out (str): A serialized json string with the metadata in Metropolis minimal schema. Will also write this to a redis stream if connected.
+
+        Raises:
+            ValueError: If labels were set and a class ID is not an integer or has no label.
+        """
+        out = self._gen_schema_arrays(bboxes, class_ids, frame_id)
+
+        if self.redis_connected:
+            self._redis_out(out)
+
+        return out
+
+    def emit_batch(self, frames, frame_ids=None, streams=None, arrays=False):
+        """
+        Generates the metadata of many frames and publishes all of them in a single redis pipeline, for example to
+        catch up with a backlog or to feed several streams at once.
+
+        Args:
+            frames (list): List of (objects, bboxes) tuples as taken by calling the object, or (bboxes, class_ids)
+                           tuples as taken by generate when arrays is True.
+            frame_ids (list[int]): ID of each frame. Defaults to consecutive values of the frame counter
+            streams (list[str]): Redis stream of each frame. Defaults to the stream given to connect_redis
+            arrays (bool): Whether frames hold NumPy arrays for generate. Defaults to False
+
+        Returns:
+            out (list[str]): The serialized json string of each frame. Will also write them to redis if connected.
+        """
+        if frame_ids is None:
+            frame_ids = range(self.frame_counter, self.frame_counter + len(frames))
+            self.frame_counter += len(frames)
+        if len(frame_ids) != len(frames):
+            raise Exception("frames and frame_ids not the same length.")
+
+        gen_schema = self._gen_schema_arrays if arrays else self._gen_schema
+        out = [gen_schema(first, second, frame_id) for (first, second), frame_id in zip(frames, frame_ids)]
+
+        if self.redis_connected:
+            if streams is None:
+                streams = [self.redis_stream] * len(out)
+            if not self.redis_client.write_many_to_stream(
+                    [(stream, {"metadata": metadata}, self.maxlen, self.retention) for stream, metadata in zip(streams, out)]):
+                raise RuntimeError("Error writing metadata batch to redis")
+
+        return out
@@ -0,0 +1,245 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a bounded buffer drained in batches by a background thread, shared by the
+buffered Redis and InfluxDB writers.
+
+Items are queued with `put` and a background thread hands them to a write callable in batches of
+up to `batch_size` items, as soon as a batch is full or `flush_interval` seconds after the first
+item of the batch was queued. When the buffer is full the queue either drops the oldest item or
+blocks the caller, depending on the configured policy.
+
+Batches that fail to be written are put back at the front of the buffer and retried with
+exponential backoff. After `max_retries` consecutive failures the batch is handed to an optional
+failure callable, and dropped if there is none or it fails too. Pending items are flushed on
+`close`.
+
+Example usage:
+::
+
+    from rrmsutils.utils.batchqueue import BatchQueue
+
+    queue = BatchQueue(redis_client.write_many_to_stream, max_size=10000, batch_size=100)
+    queue.put([("detection", {"data": "..."}, 1000)])
+    queue.close()
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+
+class BatchQueue:
+    """Bounded buffer with a background batch writer
+    """
+
+    def __init__(self, write, max_size: int = 10000, batch_size: int = 100, flush_interval: float = 0.05,
+                 policy: str = DROP_OLDEST, max_retries: int = 3, retry_interval: float = 0.1, on_failure=None,
+                 name: str = "BatchQueue", logger=None):
+        """
+        Initializes the queue and starts the background writer thread.
+
+        Args:
+            write (callable): Writes a list of items, returning True on success and False otherwise. Exceptions
+                              it raises are logged and count as failed writes.
+            max_size (int, optional): The maximum number of items kept in the buffer. Defaults to 10000.
+            batch_size (int, optional): The maximum number of items written at once. Defaults to 100.
+            flush_interval (float, optional): The maximum time in seconds an item waits in the buffer before
+                                              being written. Defaults to 0.05.
+            policy (str, optional): What to do when the buffer is full, either "drop_oldest" or "block".
+                                    Defaults to "drop_oldest".
+            max_retries (int, optional): The number of times a failed batch is retried. Defaults to 3.
+            retry_interval (float, optional): The delay in seconds before the first retry. It doubles on every
+                                              retry. Defaults to 0.1.
+            on_failure (callable, optional): Called with the batches that failed every retry, returning True if
+                                             it kept them and False otherwise. Defaults to None (drop them).
+            name (str, optional): The name of the writer thread. Defaults to "BatchQueue".
+            logger (logging.Logger, optional): The logger instance to log messages. Defaults to None.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown buffer policy {policy}")
+
+        self.__write = write
+        self.__max_size = max_size
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__policy = policy
+        self.__max_retries = max_retries
+        self.__retry_interval = retry_interval
+        self.__on_failure = on_failure
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.__buffer = deque()
+        self.__in_flight = 0
+        self.__flushing = 0
+        self.__dropped = 0
+        self.__closed = False
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        self.__idle = threading.Condition(self.__lock)
+
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    @property
+    def dropped(self) -> int:
+        """Number of items discarded because the buffer was full or every retry failed"""
+        return self.__dropped
+
+    def put(self, items: list) -> bool:
+        """Queue items to be written
+
+        Args:
+            items (list): The items.
+        Returns:
+            bool: True if the items were queued, False if the queue is closed.
+        """
+        with self.__lock:
+            if self.__closed:
+                return False
+
+            was_empty = not self.__buffer
+            for item in items:
+                if len(self.__buffer) >= self.__max_size:
+                    if self.__policy == BLOCK:
+                        while len(self.__buffer) >= self.__max_size and not self.__closed:
+                            self.__not_full.wait()
+                        if self.__closed:
+                            return False
+                    else:
+                        self.__buffer.popleft()
+                        self.__dropped += 1
+                self.__buffer.append(item)
+
+            if was_empty or len(self.__buffer) >= self.__batch_size:
+                self.__not_empty.notify()
+
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued item has been written
+
+        Args:
+            timeout (float, optional): The maximum time to wait in seconds. Defaults to None (wait forever).
+        Returns:
+            bool: True if the buffer was drained, False if the timeout expired.
+        """
+        with self.__lock:
+            self.__flushing += 1
+            self.__not_empty.notify()
+            try:
+                return self.__idle.wait_for(lambda: not self.__buffer and self.__in_flight == 0, timeout)
+            finally:
+                self.__flushing -= 1
+
+    def close(self, timeout: float = None):
+        """Flush pending items and stop the background thread
+
+        Args:
+            timeout (float, optional): The maximum time to wait for the flush in seconds. Defaults to None.
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__not_empty.notify()
+            self.__not_full.notify_all()
+
+        self.__thread.join(timeout)
+
+    def __take_batch(self) -> list:
+        with self.__lock:
+            deadline = None
+            while not self.__closed:
+                if len(self.__buffer) >= self.__batch_size or (self.__buffer and self.__flushing):
+                    break
+
+                if not self.__buffer:
+                    deadline = None
+                    self.__not_empty.wait()
+                    continue
+
+                if deadline is None:
+                    deadline = time.monotonic() + self.__flush_interval
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.__not_empty.wait(remaining)
+
+            count = min(len(self.__buffer), self.__batch_size)
+            batch = [self.__buffer.popleft() for _ in range(count)]
+            self.__in_flight = count
+            self.__not_full.notify_all()
+            return batch
+
+    def __requeue(self, batch: list):
+        """Puts a failed batch back at the front of the buffer, dropping the oldest items if it overflows"""
+        self.__buffer.extendleft(reversed(batch))
+        if self.__policy == DROP_OLDEST:
+            while len(self.__buffer) > self.__max_size:
+                self.__buffer.popleft()
+                self.__dropped += 1
+
+    def __try_write(self, batch: list) -> bool:
+        """Writes a batch, treating an exception raised by the write callable as a failed write"""
+        try:
+            return self.__write(batch)
+        except Exception as e:
+            self.logger.error("Error writing a batch: %s", e)
+            return False
+
+    def __give_up(self, batch: list) -> bool:
+        """Hands a batch that failed every retry to the failure callable, returning whether it was kept"""
+        if self.__on_failure is None:
+            return False
+        try:
+            return self.__on_failure(batch)
+        except Exception as e:
+            self.logger.error("Error handling a failed batch: %s", e)
+            return False
+
+    def __run(self):
+        failures = 0
+        while True:
+            batch = self.__take_batch()
+            written = not batch or self.__try_write(batch)
+            failures = 0 if written else failures + 1
+
+            kept = False
+            if failures > self.__max_retries:
+                kept = self.__give_up(batch)
+                if not kept:
+                    self.logger.error("Dropping %d items after %d failed retries", len(batch), self.__max_retries)
+
+            with self.__lock:
+                if failures > self.__max_retries:
+                    if not kept:
+                        self.__dropped += len(batch)
+                    failures = 0
+                elif failures:
+                    self.__requeue(batch)
+                self.__in_flight = 0
+                if not self.__buffer:
+                    self.__idle.notify_all()
+                if self.__closed and not self.__buffer:
+                    return
+
+            if failures:
+                # Give the server time to recover before retrying the batch
+                time.sleep(self.__retry_interval * 2 ** (failures - 1))
@@ -0,0 +1,271 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a dwell-time tracker that measures how long every object stays inside
+every engagement ROI, and stores the counters in Redis with batched writes.
+
+The DwellTracker keeps, for every ROI, the objects currently inside it and the time they were
+last seen there. When an object is seen inside an ROI again within `message_expiration`
+seconds, the time since the previous sighting is added to its dwell time. An object seen
+outside the ROI, or not seen for `message_expiration` seconds, ends its visit.
+
+Dwell times are aggregated in memory and written to Redis once every `db_update_period`
+seconds with a single `RedisClient.increment_fields` call, instead of one increment per object
+per frame. The totals of every ROI are stored in the ``<prefix>:<roi id>`` hash, with the fields:
+
+- ``dwell``: The dwell time of all the objects in seconds.
+- ``visits``: The number of visits.
+
+The totals hashes do not expire unless an expiration time is given. Object IDs never stop
+growing, so the dwell time of every object is stored apart, in one hash per ROI and
+`objects_period` (a UTC day by default): ``<prefix>:<roi id>:objects:<period start>``, where the
+period start is in seconds since the epoch. Every field holds the dwell time in seconds of an
+object during the period, and each hash expires one period after the period ends.
+
+``dwell`` and ``visits`` are reserved names, `update` rejects them as object IDs.
+
+Example usage:
+::
+
+    from rrmsutils.utils.dwelltracker import DwellTracker
+    from rrmsutils.utils.roi import compile_rois
+
+    tracker = DwellTracker.from_configuration(redis_client, configuration)
+    rois = compile_rois(configuration)
+
+    while True:
+        frame, last_id = generator.get(last_id=last_id)
+        if frame and frame.cameraid in rois:
+            tracker.update_frame(frame, rois[frame.cameraid])
+
+        tracker.poll()
+"""
+
+import math
+import time
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.configuration import Configuration
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.utils.redisclient import RedisClient
+from rrmsutils.utils.roi import CompiledROI
+
+# Hash fields holding the ROI totals, which cannot be used as object IDs
+_TOTALS = frozenset(("dwell", "visits"))
+
+
+class DwellTracker:
+    """Per object dwell-time tracker with batched Redis writes
+    """
+
+    def __init__(self, redis_client: RedisClient, message_expiration: float = 5, db_update_period: float = 5,
+                 prefix: str = "engagement", ex: int = None, objects_period: int = 86400, clock=time.time):
+        """
+        Initializes the tracker.
+
+        Args:
+            redis_client (RedisClient): The Redis client the counters are written with.
+            message_expiration (float, optional): Objects not seen in an ROI for this number of seconds leave it.
+                                                  Defaults to 5.
+            db_update_period (float, optional): Period in seconds at which `poll` writes the counters.
+                                                Defaults to 5.
+            prefix (str, optional): The prefix of the Redis keys. Defaults to "engagement".
+            ex (int, optional): The expiration time in seconds of the totals hashes, refreshed on every write.
+                                Defaults to None.
+            objects_period (int, optional): The period in seconds covered by every per-object dwell time hash.
+                                            Defaults to 86400 (one day).
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+        """
+        self.__redis = redis_client
+        self.__expiration = message_expiration
+        self.__update_period = db_update_period
+        self.__prefix = prefix
+        self.__ex = ex
+        self.__objects_period = objects_period
+        self.__clock = clock
+
+        self.__last_seen = {}
+        self.__pending = {}
+        self.__next_update = None
+
+    @classmethod
+    def from_configuration(cls, redis_client: RedisClient, configuration: Configuration, prefix: str = "engagement",
+                           ex: int = None, objects_period: int = 86400, clock=time.time) -> "DwellTracker":
+        """Create a tracker from the engagement configuration
+
+        Args:
+            redis_client (RedisClient): The Redis client the counters are written with.
+            configuration (Configuration): The engagement configuration.
+            prefix (str, optional): The prefix of the Redis keys. Defaults to "engagement".
+            ex (int, optional): The expiration time in seconds of the totals hashes, refreshed on every write. It
+                                should be several times the `db_update_period` of the configuration, or the totals
+                                are lost whenever a period passes without writes. Defaults to None (no expiration).
+            objects_period (int, optional): The period in seconds covered by every per-object dwell time hash.
+                                            Defaults to 86400 (one day).
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+
+        Returns:
+            DwellTracker: The tracker.
+        """
+        return cls(redis_client, configuration.message_expiration, configuration.db_update_period, prefix, ex,
+                   objects_period, clock)
+
+    def __counters(self, roi_id: str) -> dict:
+        counters = self.__pending.get(roi_id)
+        if counters is None:
+            counters = {"dwell": 0.0, "visits": 0}
+            self.__pending[roi_id] = counters
+        return counters
+
+    def update(self, roi_id: str, objectids: list, inside, timestamp: float = None):
+        """Record the objects seen in a frame
+
+        Args:
+            roi_id (str): The ROI the objects were tested against.
+            objectids (list): The ID of every object seen.
+            inside (np.ndarray): Boolean array with one element per object, True for the objects inside the ROI.
+            timestamp (float, optional): The time of the frame in seconds. Defaults to None (the clock time).
+
+        Raises:
+            ValueError: If an object ID is "dwell" or "visits", the names of the ROI total fields.
+        """
+        if not _TOTALS.isdisjoint(objectids):
+            raise ValueError(f"Object IDs cannot be {' or '.join(sorted(_TOTALS))}")
+
+        timestamp = self.__clock() if timestamp is None else timestamp
+        last_seen = self.__last_seen.setdefault(roi_id, {})
+        counters = self.__counters(roi_id)
+        expiration = self.__expiration
+
+        dwell = 0.0
+        for objectid, is_inside in zip(objectids, np.asarray(inside, dtype=bool).tolist()):
+            previous = last_seen.pop(objectid, None)
+            if not is_inside:
+                continue
+
+            if previous is None or timestamp - previous > expiration:
+                counters["visits"] += 1
+            elif timestamp > previous:
+                elapsed = timestamp - previous
+                counters[objectid] = counters.get(objectid, 0.0) + elapsed
+                dwell += elapsed
+            last_seen[objectid] = timestamp if previous is None else max(timestamp, previous)
+
+        counters["dwell"] += dwell
+
+    def update_frame(self, frame: Frame, roi: CompiledROI, timestamp: float = None):
+        """Test the detections of a frame against an ROI and record them
+
+        Args:
+            frame (Frame): The frame.
+            roi (CompiledROI): The ROI of the frame camera.
+            timestamp (float, optional): The time of the frame in seconds. Defaults to None (the clock time).
+        """
+        inside = roi.contains_points([detection.position for detection in frame.detections])
+        self.update(roi.id, [detection.objectid for detection in frame.detections], inside, timestamp)
+
+    def dwell(self, roi_id: str) -> dict:
+        """Get the dwell time not written to Redis yet
+
+        Args:
+            roi_id (str): The ROI.
+
+        Returns:
+            dict: The dwell time in seconds of every object, since the last write.
+        """
+        counters = self.__pending.get(roi_id, {})
+        return {field: value for field, value in counters.items() if field not in _TOTALS}
+
+    def active(self, roi_id: str) -> list:
+        """Get the objects currently inside an ROI
+
+        Args:
+            roi_id (str): The ROI.
+
+        Returns:
+            list: The object IDs.
+        """
+        return list(self.__last_seen.get(roi_id, {}))
+
+    def expire(self, now: float = None):
+        """End the visits of the objects not seen for `message_expiration` seconds
+
+        Args:
+            now (float, optional): The current time in seconds. Defaults to None (the clock time).
+        """
+        now = self.__clock() if now is None else now
+        for last_seen in self.__last_seen.values():
+            expired = [objectid for objectid, seen in last_seen.items() if now - seen > self.__expiration]
+            for objectid in expired:
+                del last_seen[objectid]
+
+    def flush(self, now: float = None) -> bool:
+        """Write the pending counters of every ROI to Redis in a single call
+
+        Args:
+            now (float, optional): The current time in seconds, which selects the per-object hashes written.
+                                   Defaults to None (the clock time).
+
+        Returns:
+            bool: True if the counters were written or there were none, False otherwise. Counters that fail to be
+                  written are kept and retried by the next flush.
+        """
+        now = self.__clock() if now is None else now
+        period_start = int(now // self.__objects_period * self.__objects_period)
+
+        counters = {}
+        expirations = {}
+        for roi_id, fields in self.__pending.items():
+            key = f"{self.__prefix}:{roi_id}"
+            totals = {field: fields[field] for field in _TOTALS if fields[field]}
+            if totals:
+                counters[key] = totals
+                expirations[key] = self.__ex
+
+            objects = {field: value for field, value in fields.items() if value and field not in _TOTALS}
+            if objects:
+                objects_key = f"{key}:objects:{period_start}"
+                counters[objects_key] = objects
+                # Kept through the next period, so the last complete period can be read
+                expirations[objects_key] = period_start + 2 * self.__objects_period - int(now)
+
+        if not counters:
+            self.__pending.clear()
+            return True
+
+        if not self.__redis.increment_fields(counters, ex=expirations):
+            return False
+
+        self.__pending.clear()
+        return True
+
+    def poll(self, now: float = None) -> bool:
+        """Expire objects and write the counters once every update period
+
+        Args:
+            now (float, optional): The current time in seconds. Defaults to None (the clock time).
+
+        Returns:
+            bool: True if the counters were written, False otherwise.
+        """
+        now = self.__clock() if now is None else now
+        if self.__next_update is None:
+            self.__next_update = now + self.__update_period
+            return False
+
+        if now < self.__next_update:
+            return False
+
+        self.__next_update += self.__update_period * max(1, math.floor((now - self.__next_update) /
+                                                                       self.__update_period) + 1)
+        self.expire(now)
+        return self.flush(now)
@@ -0,0 +1,278 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a long-lived attention heatmap: an occupancy grid that accumulates
+detection positions and decays exponentially over time.
+
+Every detection adds one to the cell holding its position, and every cell loses half its value
+each `half_life` seconds. Decaying every cell at every frame would cost the whole grid per
+frame, so the decay is applied lazily instead: the grid stores values divided by a global
+decay factor. A detection seen t seconds after a reference time adds 2 ** (t / half_life)
+rather than one, and reading the grid multiplies it by the decay since the reference time. The
+grid is only rescaled when the added weights grow large, once every forty half lives.
+
+The grid can be exported as a dense array or as a `Heatmap` with one blob per occupied cell,
+and snapshots of the whole state can be saved to bytes, files or Redis and restored later.
+
+Example usage:
+::
+
+    from rrmsutils.utils.heatmapaccumulator import HeatmapAccumulator
+
+    accumulator = HeatmapAccumulator.load_from_redis(redis_client, "attention")
+    if accumulator is None:
+        accumulator = HeatmapAccumulator(1920, 1080, cell_size=20, half_life=3600)
+
+    frame, last_id = generator.get(last_id=last_id)
+    if frame:
+        accumulator.add_frame(frame)
+
+    image = accumulator.grid()
+    heatmap = accumulator.to_heatmap(threshold=0.1)
+    accumulator.save_to_redis(redis_client, "attention")
+"""
+
+import io
+import math
+import time
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.models.heatmap import Heatmap
+from rrmsutils.utils.points import as_points
+from rrmsutils.utils.redisclient import RedisClient
+
+# Rescale the grid once new detections weigh this much more than at the reference time
+_MAX_WEIGHT = 1e12
+_MAX_EXPONENT = math.log(_MAX_WEIGHT)
+
+
+class HeatmapAccumulator:
+    """Exponentially decaying occupancy grid
+    """
+
+    def __init__(self, width: int, height: int, cell_size: float = 10, half_life: float = 3600,
+                 clock=time.time):
+        """
+        Initializes an empty accumulator.
+
+        Args:
+            width (int): The width of the space of the detection positions.
+            height (int): The height of the space of the detection positions.
+            cell_size (float, optional): The side of a grid cell, in position units. Defaults to 10.
+            half_life (float, optional): The time in seconds for a detection to lose half its weight.
+                                         Defaults to 3600.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+        """
+        self.__width = width
+        self.__height = height
+        self.__cell_size = cell_size
+        self.__half_life = half_life
+        self.__rate = math.log(2) / half_life
+        self.__clock = clock
+
+        self.__grid = np.zeros((math.ceil(height / cell_size), math.ceil(width / cell_size)), dtype=np.float64)
+        self.__reference = None
+
+    @property
+    def shape(self) -> tuple:
+        """The (rows, columns) shape of the grid"""
+        return self.__grid.shape
+
+    def __weight(self, timestamp: float) -> float:
+        """Gets the weight of a detection relative to the reference time, rescaling the grid if needed"""
+        if self.__reference is None:
+            self.__reference = timestamp
+
+        exponent = self.__rate * (timestamp - self.__reference)
+        if exponent <= _MAX_EXPONENT:
+            return math.exp(exponent)
+
+        # Checked before exp, which overflows after a gap of about a thousand half lives
+        scale = math.exp(-exponent)
+        if scale > 0:
+            self.__grid *= scale
+        else:
+            self.__grid.fill(0)
+        self.__reference = timestamp
+        return 1.0
+
+    def add(self, positions, timestamp: float = None):
+        """Accumulate detection positions
+
+        Args:
+            positions (np.ndarray): Array of shape (N, 2) or (N, 3) with the positions. Only x and y are used,
+                                    positions outside the grid are ignored.
+            timestamp (float, optional): The time of the detections in seconds. Defaults to None (the clock time).
+        """
+        positions = as_points(positions)
+        if len(positions) == 0:
+            return
+
+        timestamp = self.__clock() if timestamp is None else timestamp
+        weight = self.__weight(timestamp)
+
+        rows, columns = self.__grid.shape
+        cells = np.floor(positions[:, 1::-1] / self.__cell_size).astype(np.int64)
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < rows) & (cells[:, 1] >= 0) & (cells[:, 1] < columns)
+        cells = cells[inside]
+        np.add.at(self.__grid.ravel(), cells[:, 0] * columns + cells[:, 1], weight)
+
+    def add_frame(self, frame: Frame, timestamp: float = None):
+        """Accumulate the positions of the detections of a frame
+
+        Args:
+            frame (Frame): The frame.
+            timestamp (float, optional): The time of the frame in seconds. Defaults to None (the clock time).
+        """
+        self.add([(detection.position.x, detection.position.y) for detection in frame.detections], timestamp)
+
+    def clear(self):
+        """Forget every detection
+        """
+        self.__grid.fill(0)
+        self.__reference = None
+
+    def grid(self, now: float = None, out: np.ndarray = None) -> np.ndarray:
+        """Get the decayed grid
+
+        Args:
+            now (float, optional): The time in seconds the grid is decayed to. Defaults to None (the clock time).
+            out (np.ndarray, optional): A float32 array with the grid shape to write into. Defaults to None
+                                        (a new array).
+
+        Returns:
+            np.ndarray: Array of shape (rows, columns) with the weight of every cell.
+        """
+        out = np.empty(self.__grid.shape, dtype=np.float32) if out is None else out
+        if self.__reference is None:
+            out.fill(0)
+            return out
+
+        now = self.__clock() if now is None else now
+        np.multiply(self.__grid, math.exp(-self.__rate * (now - self.__reference)), out=out, casting="unsafe")
+        return out
+
+    def to_heatmap(self, threshold: float = 0.05, max_blobs: int = None) -> Heatmap:
+        """Get the grid as a heatmap, with one blob per cell
+
+        The decay scales every cell alike, so the heatmap does not depend on the time it is taken at.
+
+        Args:
+            threshold (float, optional): Cells weighing less than this fraction of the heaviest cell are left out.
+                                         Defaults to 0.05.
+            max_blobs (int, optional): Keep only this number of the heaviest cells. Defaults to None (no limit).
+
+        Returns:
+            Heatmap: Blobs at the cell centers, with a radius of half a cell and the cell weight relative to the
+                     heaviest cell as intensity, heaviest first.
+        """
+        grid = self.__grid
+        peak = grid.max(initial=0)
+        if self.__reference is None or peak <= 0:
+            return Heatmap(heatmap=[])
+
+        rows, columns = np.nonzero(grid >= threshold * peak)
+        weights = grid[rows, columns] / peak
+        order = np.argsort(-weights, kind="stable")[:max_blobs]
+
+        half = self.__cell_size / 2
+        xs = np.minimum(columns[order] * self.__cell_size + half, self.__width).round().astype(np.int64)
+        ys = np.minimum(rows[order] * self.__cell_size + half, self.__height).round().astype(np.int64)
+        return Heatmap.model_validate({"heatmap": [
+            {"position": {"x": x, "y": y}, "intensity": weight, "radius": half}
+            for x, y, weight in zip(xs.tolist(), ys.tolist(), weights[order].tolist())]})
+
+    def snapshot(self) -> bytes:
+        """Serialize the accumulator state
+
+        Returns:
+            bytes: The compressed snapshot.
+        """
+        buffer = io.BytesIO()
+        reference = np.nan if self.__reference is None else self.__reference
+        np.savez_compressed(buffer, grid=self.__grid,
+                            parameters=np.array([self.__width, self.__height, self.__cell_size, self.__half_life,
+                                                 reference], dtype=np.float64))
+        return buffer.getvalue()
+
+    @classmethod
+    def restore(cls, data: bytes, clock=time.time) -> "HeatmapAccumulator":
+        """Create an accumulator from a snapshot
+
+        Args:
+            data (bytes): The snapshot.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+
+        Returns:
+            HeatmapAccumulator: The accumulator, in the state of the snapshot.
+        """
+        with np.load(io.BytesIO(data)) as arrays:
+            width, height, cell_size, half_life, reference = arrays["parameters"].tolist()
+            accumulator = cls(int(width), int(height), cell_size, half_life, clock)
+            accumulator.__grid[...] = arrays["grid"]
+
+        accumulator.__reference = None if math.isnan(reference) else reference
+        return accumulator
+
+    def save(self, path: str):
+        """Save a snapshot to a file
+
+        Args:
+            path (str): The file path.
+        """
+        with open(path, "wb") as file:
+            file.write(self.snapshot())
+
+    @classmethod
+    def load(cls, path: str, clock=time.time) -> "HeatmapAccumulator":
+        """Create an accumulator from a snapshot file
+
+        Args:
+            path (str): The file path.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+
+        Returns:
+            HeatmapAccumulator: The accumulator, in the state of the snapshot.
+        """
+        with open(path, "rb") as file:
+            return cls.restore(file.read(), clock)
+
+    def save_to_redis(self, redis_client: RedisClient, key: str, ex: int = None) -> bool:
+        """Save a snapshot to a Redis key
+
+        Args:
+            redis_client (RedisClient): The Redis client.
+            key (str): The key.
+            ex (int, optional): The expiration time in seconds. Defaults to None.
+
+        Returns:
+            bool: True if the snapshot was saved, False otherwise.
+        """
+        return redis_client.set(key, self.snapshot(), ex=ex)
+
+    @classmethod
+    def load_from_redis(cls, redis_client: RedisClient, key: str, clock=time.time) -> "HeatmapAccumulator":
+        """Create an accumulator from a snapshot saved in a Redis key
+
+        Args:
+            redis_client (RedisClient): The Redis client. It must be created with decode_responses=False.
+            key (str): The key.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+
+        Returns:
+            HeatmapAccumulator: The accumulator, or None if the key does not exist.
+        """
+        data = redis_client.get(key)
+        if data is None:
+            return None
+        return cls.restore(data, clock)
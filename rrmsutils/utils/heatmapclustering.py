@@ -0,0 +1,410 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides an incremental, sliding-window DBSCAN engine that clusters detection
+positions into heatmap blobs.
+
+The engagement heatmap configuration (`window_seconds`, `eps`, `min_samples`,
+`update_period`) describes a DBSCAN clustering of the detections seen in the last window.
+Instead of re-clustering the whole window at every update, the HeatmapClustering engine:
+
+- Stores the positions in a grid hash with cells of side eps / sqrt(2), so any two points of a
+  cell are neighbors and the neighbors of a point are found in the 5x5 cells around it.
+- Keeps the neighbor count, and so the core status, of every point up to date as points are
+  inserted and expire.
+- Links two cells holding core points when some pair of their cores are neighbors. Clusters
+  are the connected components of this cell graph, which is exactly DBSCAN on the core points.
+  Links are only recomputed around the cells that changed since the previous update.
+- Keeps running position sums per cell, and per cell and cluster for border points, so blobs
+  are built from cells without visiting the points.
+
+Point level work therefore scales with the churn of the window. The rest of an update scales
+with the number of occupied cells, which is bounded by the monitored area, not the number of
+detections in the window.
+
+Every cluster becomes a `Blob` placed at its centroid, with its RMS distance to the centroid
+as radius and its number of points, normalized by the largest cluster, as intensity.
+
+Example usage:
+::
+
+    from rrmsutils.utils.heatmapclustering import HeatmapClustering
+
+    engine = HeatmapClustering.from_configuration(configuration.heatmap)
+
+    while True:
+        frame, last_id = generator.get(last_id=last_id)
+        if frame:
+            engine.add_frame(frame)
+
+        heatmap = engine.poll()
+        if heatmap:
+            heatmap_generator.send(heatmap)
+"""
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.configuration import Heatmap as HeatmapConfiguration
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.models.heatmap import Blob, Heatmap
+from rrmsutils.models.point import Point2D
+from rrmsutils.utils.points import as_points
+
+_OFFSETS = [(i, j) for i in range(-2, 3) for j in range(-2, 3)]
+
+
+class _Point:
+    """A position in the window"""
+
+    __slots__ = ("x", "y", "count", "cell")
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+        self.count = 1
+        self.cell = None
+
+
+class _Cell:
+    """A grid cell, with the running sums of its points positions"""
+
+    __slots__ = ("key", "points", "cores", "links", "borders", "count", "sum_x", "sum_y", "sum_squares")
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.points = set()
+        self.cores = 0
+        # Cells holding a core that is a neighbor of a core of this cell, with that pair of cores as witness
+        self.links = {}
+        # For cells without cores, the sums of the border points attached to each cell holding cores
+        self.borders = {}
+        self.count = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_squares = 0.0
+
+    def add(self, point: _Point):
+        self.points.add(point)
+        point.cell = self
+        self.count += 1
+        self.sum_x += point.x
+        self.sum_y += point.y
+        self.sum_squares += point.x * point.x + point.y * point.y
+
+    def remove(self, point: _Point):
+        self.points.discard(point)
+        self.count -= 1
+        self.sum_x -= point.x
+        self.sum_y -= point.y
+        self.sum_squares -= point.x * point.x + point.y * point.y
+
+
+class HeatmapClustering:
+    """Incremental sliding-window DBSCAN heatmap engine
+    """
+
+    def __init__(self, window_seconds: float = 5, eps: float = 50, min_samples: int = 3, update_period: float = 30,
+                 clock=time.time):
+        """
+        Initializes the engine.
+
+        Args:
+            window_seconds (float, optional): The time window in seconds of the clustered detections. Defaults to 5.
+            eps (float, optional): The maximum distance between two neighbor points. Defaults to 50.
+            min_samples (int, optional): The number of points, including itself, in the neighborhood of a
+                                         core point. Defaults to 3.
+            update_period (float, optional): Period in seconds at which `poll` produces a heatmap. Defaults to 30.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+        """
+        self.__window = window_seconds
+        self.__eps_squared = eps * eps
+        self.__side = eps / math.sqrt(2)
+        self.__min_samples = min_samples
+        self.__update_period = update_period
+        self.__clock = clock
+
+        self.__cells = {}
+        self.__arrivals = deque()
+        self.__dirty = set()
+        self.__gained = set()
+        self.__lost = set()
+        self.__next_update = None
+        self.__heatmap = Heatmap(heatmap=[])
+
+    @classmethod
+    def from_configuration(cls, configuration: HeatmapConfiguration, clock=time.time) -> "HeatmapClustering":
+        """Create an engine from the engagement heatmap configuration
+
+        Args:
+            configuration (HeatmapConfiguration): The heatmap section of the engagement configuration.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.time.
+
+        Returns:
+            HeatmapClustering: The engine.
+        """
+        return cls(configuration.window_seconds, configuration.eps, configuration.min_samples,
+                   configuration.update_period, clock)
+
+    def __len__(self) -> int:
+        return sum(cell.count for cell in self.__cells.values())
+
+    def __around(self, key: tuple):
+        """Yields the existing cells that may hold neighbors of the points of a cell, including itself"""
+        cells = self.__cells
+        i, j = key
+        for di, dj in _OFFSETS:
+            cell = cells.get((i + di, j + dj))
+            if cell is not None:
+                yield cell
+
+    def __update_counts(self, point: _Point, key: tuple, delta: int):
+        """Adds delta to the neighbor count of the neighbors of a point, tracking core status changes"""
+        eps_squared = self.__eps_squared
+        min_samples = self.__min_samples
+        threshold = min_samples if delta > 0 else min_samples - 1
+        changes = self.__gained if delta > 0 else self.__lost
+        x, y = point.x, point.y
+        for cell in self.__around(key):
+            changed = False
+            same = cell.key == key
+            for other in cell.points:
+                if other is point or not (same or (other.x - x) ** 2 + (other.y - y) ** 2 <= eps_squared):
+                    continue
+                other.count += delta
+                if delta > 0:
+                    point.count += 1
+                if other.count == threshold:
+                    cell.cores += delta
+                    changes.add(other)
+                    changed = True
+            if changed:
+                self.__dirty.add(cell)
+
+    def add(self, positions, timestamp: float = None):
+        """Insert detection positions into the window
+
+        Args:
+            positions (np.ndarray): Array of shape (N, 2) or (N, 3) with the positions. Only x and y are clustered.
+            timestamp (float, optional): The time of the detections in seconds. Defaults to None (the clock time).
+        """
+        positions = as_points(positions)
+        if len(positions) == 0:
+            return
+
+        timestamp = self.__clock() if timestamp is None else timestamp
+
+        side = self.__side
+        arrival = []
+        for x, y in positions[:, :2].tolist():
+            point = _Point(x, y)
+            key = (math.floor(x / side), math.floor(y / side))
+            self.__update_counts(point, key, 1)
+
+            cell = self.__cells.get(key)
+            if cell is None:
+                cell = _Cell(key)
+                self.__cells[key] = cell
+            cell.add(point)
+            if point.count >= self.__min_samples:
+                cell.cores += 1
+                self.__gained.add(point)
+            self.__dirty.add(cell)
+            arrival.append((point, cell))
+
+        self.__arrivals.append((timestamp, arrival))
+
+    def add_frame(self, frame: Frame, timestamp: float = None):
+        """Insert the positions of the detections of a frame into the window
+
+        Args:
+            frame (Frame): The frame.
+            timestamp (float, optional): The time of the frame in seconds. Defaults to None (the clock time).
+        """
+        self.add([(detection.position.x, detection.position.y) for detection in frame.detections], timestamp)
+
+    def __expire(self, now: float):
+        while self.__arrivals and self.__arrivals[0][0] <= now - self.__window:
+            _, arrival = self.__arrivals.popleft()
+            for point, cell in arrival:
+                cell.remove(point)
+                if point.count >= self.__min_samples:
+                    cell.cores -= 1
+                    self.__lost.add(point)
+                self.__update_counts(point, cell.key, -1)
+                self.__dirty.add(cell)
+
+    def __cores(self, cell: _Cell) -> list:
+        min_samples = self.__min_samples
+        return [point for point in cell.points if point.count >= min_samples]
+
+    def __link(self, cell: _Cell, other: _Cell, cores: list) -> bool:
+        """Links two cells if one of the given cores of the first is a neighbor of a core of the second"""
+        eps_squared = self.__eps_squared
+        others = self.__cores(other)
+        for core in cores:
+            x, y = core.x, core.y
+            for other_core in others:
+                if (other_core.x - x) ** 2 + (other_core.y - y) ** 2 <= eps_squared:
+                    cell.links[other] = (core, other_core)
+                    other.links[cell] = (other_core, core)
+                    return True
+        return False
+
+    def __update_links(self):
+        """Updates the links after core points were gained and lost
+
+        A link is only checked again when a core of its witness pair is lost, and a gained core is
+        only checked against the cells it is not linked to yet.
+        """
+        min_samples = self.__min_samples
+        for point in self.__lost:
+            cell = point.cell
+            if point in cell.points and point.count >= min_samples:
+                continue
+            for other, (core, _) in list(cell.links.items()):
+                if core is point:
+                    del cell.links[other]
+                    del other.links[cell]
+                    self.__link(cell, other, self.__cores(cell))
+
+        for point in self.__gained:
+            cell = point.cell
+            if point not in cell.points or point.count < min_samples:
+                continue
+            for other in self.__around(cell.key):
+                if other is not cell and other.cores and other not in cell.links:
+                    self.__link(cell, other, [point])
+
+        self.__lost.clear()
+        self.__gained.clear()
+
+    def __attach_borders(self, cell: _Cell):
+        """Attaches every border point of a cell without cores to a neighbor cell holding cores"""
+        cell.borders = {}
+        if cell.cores:
+            return
+
+        eps_squared = self.__eps_squared
+        candidates = [(other, self.__cores(other)) for other in self.__around(cell.key) if other.cores]
+        for point in cell.points:
+            x, y = point.x, point.y
+            for other, cores in candidates:
+                if any((core.x - x) ** 2 + (core.y - y) ** 2 <= eps_squared for core in cores):
+                    sums = cell.borders.setdefault(other, [0, 0.0, 0.0, 0.0])
+                    sums[0] += 1
+                    sums[1] += x
+                    sums[2] += y
+                    sums[3] += x * x + y * y
+                    break
+
+    def __recluster(self):
+        """Updates the links and border points around the changed cells"""
+        touched = set()
+        for cell in self.__dirty:
+            touched.update(self.__around(cell.key))
+
+        self.__update_links()
+
+        for cell in touched:
+            self.__attach_borders(cell)
+
+        for cell in self.__dirty:
+            if not cell.points:
+                self.__cells.pop(cell.key, None)
+        self.__dirty.clear()
+
+    def __clusters(self) -> list:
+        """Groups the cells holding cores into clusters and sums the positions of their points"""
+        component = {}
+        clusters = []
+        for cell in self.__cells.values():
+            if not cell.cores or cell in component:
+                continue
+
+            sums = [0, 0.0, 0.0, 0.0]
+            component[cell] = sums
+            pending = [cell]
+            while pending:
+                current = pending.pop()
+                sums[0] += current.count
+                sums[1] += current.sum_x
+                sums[2] += current.sum_y
+                sums[3] += current.sum_squares
+                for other in current.links:
+                    if other not in component:
+                        component[other] = sums
+                        pending.append(other)
+            clusters.append(sums)
+
+        for cell in self.__cells.values():
+            for other, border in cell.borders.items():
+                sums = component[other]
+                for i in range(4):
+                    sums[i] += border[i]
+
+        return clusters
+
+    def update(self, now: float = None) -> Heatmap:
+        """Expire old detections, update the clusters and build the heatmap
+
+        Args:
+            now (float, optional): The current time in seconds. Defaults to None (the clock time).
+
+        Returns:
+            Heatmap: A heatmap with one blob per cluster.
+        """
+        now = self.__clock() if now is None else now
+        self.__expire(now)
+        self.__recluster()
+
+        clusters = self.__clusters()
+        largest = max((size for size, _, _, _ in clusters), default=1)
+
+        blobs = []
+        for size, sum_x, sum_y, sum_squares in clusters:
+            x = sum_x / size
+            y = sum_y / size
+            variance = max(sum_squares / size - x * x - y * y, 0.0)
+            blobs.append(Blob(position=Point2D(x=round(x), y=round(y)), intensity=size / largest,
+                              radius=math.sqrt(variance)))
+
+        self.__heatmap = Heatmap(heatmap=blobs)
+        return self.__heatmap
+
+    def poll(self, now: float = None) -> Heatmap:
+        """Build the heatmap once every update period
+
+        Args:
+            now (float, optional): The current time in seconds. Defaults to None (the clock time).
+
+        Returns:
+            Heatmap: The heatmap if an update period elapsed since the last one, None otherwise.
+        """
+        now = self.__clock() if now is None else now
+        if self.__next_update is None:
+            self.__next_update = now + self.__update_period
+            return None
+
+        if now < self.__next_update:
+            return None
+
+        self.__next_update += self.__update_period * max(1, math.floor((now - self.__next_update) /
+                                                                       self.__update_period) + 1)
+        return self.update(now)
+
+    @property
+    def heatmap(self) -> Heatmap:
+        """The heatmap built by the last update"""
+        return self.__heatmap
@@ -0,0 +1,167 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a rasterizer that paints a `Heatmap` into a dense intensity image.
+
+Every blob is splatted as a stamp scaled by its intensity, either a Gaussian or a flat disc.
+Stamps are computed once per radius, quantized to half an output pixel, and cached, so
+rendering a heatmap only adds precomputed stamps into the output. The output buffer is reused
+across renders.
+
+The Gaussian stamp has the blob radius as RMS distance to its center, matching the radius of
+the blobs produced by `rrmsutils.utils.heatmapclustering`, and is truncated at three standard
+deviations.
+
+Example usage:
+::
+
+    from rrmsutils.utils.heatmaprasterizer import HeatmapRasterizer
+
+    # Paint heatmaps of a 1920x1080 camera into a 480x270 overlay
+    rasterizer = HeatmapRasterizer(480, 270, source_size=(1920, 1080))
+
+    heatmap, _ = heatmap_generator.get()
+    image = rasterizer.render(heatmap, normalize=True)
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from rrmsutils.models.heatmap import Heatmap
+
+GAUSSIAN = "gaussian"
+DISC = "disc"
+
+
+class HeatmapRasterizer:
+    """Heatmap rasterizer with cached kernel stamps
+    """
+
+    def __init__(self, width: int, height: int, source_size: tuple = None, kernel: str = GAUSSIAN,
+                 max_kernels: int = 256):
+        """
+        Initializes the rasterizer.
+
+        Args:
+            width (int): The width of the output image.
+            height (int): The height of the output image.
+            source_size (tuple, optional): The (width, height) of the space of the blob positions and radii.
+                                           Defaults to None (the output size).
+            kernel (str, optional): The stamp shape, either "gaussian" or "disc". Defaults to "gaussian".
+            max_kernels (int, optional): The maximum number of cached stamps. The least recently used stamps
+                                         are evicted first. Defaults to 256.
+
+        Raises:
+            ValueError: If the kernel is not supported.
+        """
+        if kernel not in (GAUSSIAN, DISC):
+            raise ValueError(f"Unsupported kernel {kernel}")
+
+        source_width, source_height = source_size or (width, height)
+        self.__scale_x = width / source_width
+        self.__scale_y = height / source_height
+        self.__scale_radius = math.sqrt(self.__scale_x * self.__scale_y)
+        self.__kernel = kernel
+        self.__max_kernels = max_kernels
+        self.__kernels = OrderedDict()
+        self.__buffer = np.zeros((height, width), dtype=np.float32)
+
+    def __stamp(self, key: int) -> np.ndarray:
+        """Gets the stamp of a radius given in half output pixels"""
+        stamp = self.__kernels.get(key)
+        if stamp is not None:
+            self.__kernels.move_to_end(key)
+            return stamp
+
+        radius = key / 2
+        if self.__kernel == GAUSSIAN:
+            sigma = max(radius / math.sqrt(2), 0.5)
+            half = math.ceil(3 * sigma)
+            axis = np.arange(-half, half + 1, dtype=np.float32)
+            profile = np.exp(-axis * axis / (2 * sigma * sigma))
+            stamp = np.outer(profile, profile)
+        else:
+            half = math.ceil(radius)
+            axis = np.arange(-half, half + 1, dtype=np.float32)
+            stamp = (axis[:, None] ** 2 + axis[None, :] ** 2 <= max(radius, 0.5) ** 2).astype(np.float32)
+
+        self.__kernels[key] = stamp
+        if len(self.__kernels) > self.__max_kernels:
+            self.__kernels.popitem(last=False)
+        return stamp
+
+    def render_arrays(self, x, y, intensity, radius, out: np.ndarray = None, normalize: bool = False) -> np.ndarray:
+        """Paint blobs given as arrays
+
+        Args:
+            x (np.ndarray): The x coordinate of every blob, in source units.
+            y (np.ndarray): The y coordinate of every blob, in source units.
+            intensity (np.ndarray): The intensity of every blob.
+            radius (np.ndarray): The radius of every blob, in source units.
+            out (np.ndarray, optional): A float32 array of shape (height, width) to paint into. It is cleared
+                                        first. Defaults to None (an internal buffer, overwritten by the next render).
+            normalize (bool, optional): Scale the image so its maximum is 1. Defaults to False.
+
+        Returns:
+            np.ndarray: The painted image.
+        """
+        out = self.__buffer if out is None else out
+        out.fill(0)
+
+        # Compute the placement of every stamp at once, so the loop only adds stamps
+        columns = np.rint(np.asarray(x, dtype=np.float64) * self.__scale_x).astype(np.int64)
+        rows = np.rint(np.asarray(y, dtype=np.float64) * self.__scale_y).astype(np.int64)
+        keys = np.rint(np.asarray(radius, dtype=np.float64) * self.__scale_radius * 2).astype(np.int64)
+        weights = np.asarray(intensity, dtype=np.float32)
+        height, width = out.shape
+
+        for column, row, key, weight in zip(columns.tolist(), rows.tolist(), keys.tolist(), weights.tolist()):
+            stamp = self.__stamp(key)
+            half = stamp.shape[0] // 2
+            top, left = row - half, column - half
+            bottom, right = top + stamp.shape[0], left + stamp.shape[1]
+            if bottom <= 0 or right <= 0 or top >= height or left >= width:
+                continue
+
+            crop_top, crop_left = max(0, -top), max(0, -left)
+            crop_bottom = stamp.shape[0] - max(0, bottom - height)
+            crop_right = stamp.shape[1] - max(0, right - width)
+            region = out[top + crop_top:top + crop_bottom, left + crop_left:left + crop_right]
+            if weight == 1.0:
+                region += stamp[crop_top:crop_bottom, crop_left:crop_right]
+            else:
+                region += weight * stamp[crop_top:crop_bottom, crop_left:crop_right]
+
+        if normalize:
+            peak = out.max(initial=0)
+            if peak > 0:
+                out *= 1 / peak
+
+        return out
+
+    def render(self, heatmap: Heatmap, out: np.ndarray = None, normalize: bool = False) -> np.ndarray:
+        """Paint a heatmap
+
+        Args:
+            heatmap (Heatmap): The heatmap.
+            out (np.ndarray, optional): A float32 array of shape (height, width) to paint into. It is cleared
+                                        first. Defaults to None (an internal buffer, overwritten by the next render).
+            normalize (bool, optional): Scale the image so its maximum is 1. Defaults to False.
+
+        Returns:
+            np.ndarray: The painted image.
+        """
+        blobs = heatmap.heatmap
+        return self.render_arrays([blob.position.x for blob in blobs], [blob.position.y for blob in blobs],
+                                  [blob.intensity for blob in blobs], [blob.radius for blob in blobs],
+                                  out=out, normalize=normalize)
@@ -56,16 +56,53 @@ Example usage:
         for record in table.records:
             print(f"{record.get_field()}: {record.get_value()}")
 
+    # Stream long-range results instead of loading every record
+    for record in influx_client.query_stream(my_query):
+        print(f"{record.get_field()}: {record.get_value()}")
+
+    # Or load them as NumPy arrays per field
+    for field, (times, values) in influx_client.query_columns(my_query).items():
+        print(field, times[-1], values.mean())
+
     # Close the client
     influx_client.close()
+
+For high-rate writes, enable batching. Writes are then queued in a bounded `BatchQueue` and a
+background thread sends them in batches, retrying with exponential backoff on failure.
+Pending points are flushed on `close`. Points are stamped with unique client times when they
+are created, so points of the same series in a batch do not overwrite each other.
+::
+
+    influx_client = InfluxDB(url=my_url, org=my_org, bucket=my_bucket, batch_size=5000, flush_interval=1.0)
+    influx_client.write_many([
+        (my_measurement, {"metric_id": "frame"}, {"objects": 3}),
+        (my_measurement, {"metric_id": "frame"}, {"objects": 4}),
+    ])
+    influx_client.close()
+
+With a spool directory, writes that fail while the server is unreachable are kept in an
+on-disk `rrmsutils.utils.spool.WriteSpool` and replayed in large, rate limited batches once
+the server recovers.
+::
+
+    influx_client = InfluxDB(url=my_url, org=my_org, bucket=my_bucket, spool_dir="/var/spool/influx")
+
+Homogeneous high-rate records can skip `Point` construction entirely by encoding line protocol
+with a `rrmsutils.utils.lineprotocol.LineProtocolEncoder` and writing it with `write_lines`.
 """
 
 import logging
 import os
+import threading
+import time
 
+import numpy as np
 from influxdb_client import InfluxDBClient, Point
 from influxdb_client.client.write_api import SYNCHRONOUS
 
+from rrmsutils.utils.batchqueue import DROP_OLDEST, BatchQueue
+from rrmsutils.utils.spool import WriteSpool
+
 
 class InfluxDB:
     """
@@ -81,9 +118,14 @@ class InfluxDB:
         The bucket name where data will be written.
     logger : logging.Logger
         The logger instance to log messages.
+    dropped : int
+        The number of points discarded in batching mode, either because the buffer was full
+        or because every retry failed.
     """
 
-    def __init__(self, url, org, bucket, logger=None):
+    def __init__(self, url, org, bucket, logger=None, batch_size=0, flush_interval=1.0, max_buffer=100000,
+                 max_retries=3, retry_interval=1.0, spool_dir=None, spool_max_bytes=256 * 1024 * 1024,
+                 replay_batch_size=5000, replay_rate=50000, replay_interval=5.0):
         """
         Initializes the InfluxDB client with the provided URL, organization, and bucket.
 
@@ -92,6 +134,24 @@ class InfluxDB:
             org (str): The organization name in InfluxDB.
             bucket (str): The bucket name in InfluxDB.
             logger (logging.Logger, optional): The logger instance to log messages. Defaults to None.
+            batch_size (int, optional): When greater than zero, writes are buffered and sent in batches of up to
+                                        this many points by a background thread. Defaults to 0 (synchronous writes).
+            flush_interval (float, optional): The maximum time in seconds a point waits in the buffer. Defaults to 1.0.
+            max_buffer (int, optional): The maximum number of buffered points. The oldest points are dropped when
+                                        the buffer is full. Defaults to 100000.
+            max_retries (int, optional): The number of times a failed batch is retried. Defaults to 3.
+            retry_interval (float, optional): The delay in seconds before the first retry. It doubles on every
+                                              retry. Defaults to 1.0.
+            spool_dir (str, optional): When set, writes that fail are stored in an on-disk `WriteSpool` in this
+                                       directory instead of being lost, and replayed once the server is reachable.
+                                       While the spool holds data, new writes go straight to it. Defaults to None.
+            spool_max_bytes (int, optional): The spool size cap. The oldest data is discarded beyond it.
+                                             Defaults to 256 MiB.
+            replay_batch_size (int, optional): The number of lines written per replay request. Defaults to 5000.
+            replay_rate (float, optional): The maximum number of lines per second written while replaying.
+                                           Defaults to 50000.
+            replay_interval (float, optional): The time in seconds between checks for a recovered server.
+                                               Defaults to 5.0.
         Raises:
             ValueError: If the environment variable 'INFLUXDB_TOKEN' is not set.
         """
@@ -104,33 +164,182 @@ class InfluxDB:
         self.bucket = bucket
         self.logger = logger or logging.getLogger(__name__)
 
+        self.__time_lock = threading.Lock()
+        self.__last_time = 0
+
+        self.__spool = None
+        self.__replay_batch_size = replay_batch_size
+        self.__replay_rate = replay_rate
+        self.__replay_interval = replay_interval
+        self.__stop_replay = threading.Event()
+        self.__replay_thread = None
+        if spool_dir:
+            self.__spool = WriteSpool(spool_dir, max_bytes=spool_max_bytes, logger=self.logger)
+            self.__replay_thread = threading.Thread(target=self.__replay, name="InfluxDBReplay", daemon=True)
+            self.__replay_thread.start()
+
+        self.__queue = None
+        if batch_size > 0:
+            self.__queue = BatchQueue(self.__write_batch, max_size=max_buffer, batch_size=batch_size,
+                                      flush_interval=flush_interval, policy=DROP_OLDEST, max_retries=max_retries,
+                                      retry_interval=retry_interval,
+                                      on_failure=self.__spool_records if self.__spool is not None else None,
+                                      name="InfluxDB", logger=self.logger)
+
+    @property
+    def dropped(self):
+        """The number of points discarded in batching mode"""
+        return self.__queue.dropped if self.__queue is not None else 0
+
+    def __make_point(self, measurement, tags, fields):
+        point = Point(measurement)
+        for tag_key, tag_value in tags.items():
+            point = point.tag(tag_key, tag_value)
+        for field_key, field_value in fields.items():
+            point = point.field(field_key, field_value)
+        return point.time(self.__timestamp())
+
+    def __timestamp(self):
+        # Batched and spooled points reach the server later, so they cannot rely on the server time. Points of
+        # the same series written in the same batch need distinct times too, or only the last one is kept.
+        with self.__time_lock:
+            self.__last_time = max(time.time_ns(), self.__last_time + 1)
+            return self.__last_time
+
+    def __spool_records(self, records):
+        lines = [record if isinstance(record, str) else record.to_line_protocol() for record in records]
+        return self.__spool.append(lines)
+
+    def __replay(self):
+        while not self.__stop_replay.wait(self.__replay_interval):
+            if not self.__spool.pending:
+                continue
+            try:
+                if not self.client.ping():
+                    continue
+                self.__replay_spool()
+            except Exception as e:
+                self.logger.error("Error replaying spooled data to InfluxDB: %s", e)
+
+    def __replay_spool(self):
+        while not self.__stop_replay.is_set():
+            segment = self.__spool.oldest_segment()
+            if segment is None:
+                return
+
+            pending = []
+            for lines in self.__spool.read_segment(segment):
+                pending.extend(lines)
+                while len(pending) >= self.__replay_batch_size:
+                    self.__replay_batch(pending[:self.__replay_batch_size])
+                    del pending[:self.__replay_batch_size]
+            if pending:
+                self.__replay_batch(pending)
+
+            self.__spool.remove_segment(segment)
+
+    def __replay_batch(self, lines):
+        started = time.monotonic()
+        self.__write(lines)
+        # Rate limit so the recovering server is not flooded
+        remaining = len(lines) / self.__replay_rate - (time.monotonic() - started)
+        if remaining > 0:
+            self.__stop_replay.wait(remaining)
+
+    def __write(self, records):
+        self.write_api.write(bucket=self.bucket, org=self.client.org, record=records)
+
+    def __write_batch(self, batch):
+        try:
+            self.__write(batch)
+            return True
+        except Exception as e:
+            self.logger.error("Error writing batch to InfluxDB: %s", e)
+            return False
+
     def write_data(self, measurement, tags, fields):
         """
         Write data to an InfluxDB bucket.
 
         This method creates a data point with the specified measurement, tags, and fields,
-        and writes it to the InfluxDB bucket associated with this instance.
+        and writes it to the InfluxDB bucket associated with this instance. In batching mode
+        the point is queued and written by the background thread.
 
         Args:
             measurement (str): The name of the measurement.
             tags (dict): A dictionary of tag key-value pairs.
             fields (dict): A dictionary of field key-value pairs.
         Returns:
-            bool: True if the data was written successfully, False otherwise.
+            bool: True if the data was written (or queued) successfully, False otherwise.
+        """
+        return self.write_many([(measurement, tags, fields)])
+
+    def write_many(self, records):
+        """
+        Write many data points to an InfluxDB bucket in a single request.
+
+        Args:
+            records (list): A list of (measurement, tags, fields) tuples, with the same meaning as the
+                            arguments of `write_data`.
+        Returns:
+            bool: True if the data was written (or queued) successfully, False otherwise.
         """
         try:
-            point = Point(measurement)
-            for tag_key, tag_value in tags.items():
-                point = point.tag(tag_key, tag_value)
-            for field_key, field_value in fields.items():
-                point = point.field(field_key, field_value)
-            self.write_api.write(bucket=self.bucket,
-                                 org=self.client.org, record=point)
-            return True
+            points = [self.__make_point(measurement, tags, fields) for measurement, tags, fields in records]
+            return self.__submit(points)
         except Exception as e:
             self.logger.error("Error writing data to InfluxDB: %s", e)
             return False
 
+    def write_lines(self, lines, sync=False):
+        """
+        Write records already encoded in line protocol, for example by a `LineProtocolEncoder`.
+
+        Args:
+            lines (list): A list of line protocol strings with nanosecond timestamps.
+            sync (bool, optional): Write immediately even in batching mode, so a True result means the data
+                                   reached the server (or the spool). Defaults to False.
+        Returns:
+            bool: True if the data was written (or queued) successfully, False otherwise.
+        """
+        try:
+            return self.__submit(lines, sync)
+        except Exception as e:
+            self.logger.error("Error writing data to InfluxDB: %s", e)
+            return False
+
+    def __submit(self, records, sync=False):
+        if self.__spool is not None and self.__spool.pending:
+            # Keep writing to the spool until the replay catches up, without blocking on the server
+            return self.__spool_records(records)
+
+        if self.__queue is not None and not sync:
+            return self.__queue.put(records)
+
+        try:
+            self.__write(records)
+        except Exception as e:
+            if self.__spool is None:
+                raise
+            self.logger.error("Error writing data to InfluxDB, spooling: %s", e)
+            return self.__spool_records(records)
+        return True
+
+    def flush(self, timeout=None):
+        """
+        Blocks until every buffered point has been written. Does nothing when batching is disabled.
+
+        Args:
+            timeout (float, optional): The maximum time to wait in seconds. Defaults to None (wait forever).
+        Returns:
+            bool: True if the buffer was drained, False if the timeout expired.
+        """
+
+        if self.__queue is None:
+            return True
+
+        return self.__queue.flush(timeout)
+
     def query_data(self, query):
         """
         Executes a query against the InfluxDB and returns the result.
@@ -144,13 +353,88 @@ class InfluxDB:
         result = self.client.query_api().query(org=self.client.org, query=query)
         return result
 
+    def query_stream(self, query):
+        """
+        Executes a query against the InfluxDB and yields the resulting records one at a time,
+        without materializing the whole result in memory.
+
+        Args:
+            query (str): The query string to be executed.
+        Returns:
+            Generator[FluxRecord]: The records of the query result.
+        """
+
+        return self.client.query_api().query_stream(org=self.client.org, query=query)
+
+    def query_columns(self, query, key="_field", chunk_size=65536):
+        """
+        Executes a query against the InfluxDB and returns the numeric values as NumPy arrays.
+
+        The result is streamed as CSV and converted in chunks, so no `FluxRecord` is built and
+        memory stays bounded by the size of the arrays. Rows whose value is not numeric are skipped.
+
+        Args:
+            query (str): The query string to be executed.
+            key (str, optional): The column used to split the result into arrays. Defaults to "_field".
+            chunk_size (int, optional): The number of rows converted at once. Defaults to 65536.
+        Returns:
+            dict: A dictionary mapping every value of the key column to a (times, values) tuple, where times is a
+            datetime64[ns] array and values a float64 array.
+        """
+
+        rows = self.client.query_api().query_csv(query, org=self.client.org)
+        pending = {}
+        chunks = {}
+        key_index = time_index = value_index = None
+
+        def convert(name):
+            times, values = pending.pop(name)
+            chunks.setdefault(name, []).append((np.array(times, dtype="datetime64[ns]"),
+                                                np.array(values, dtype=np.float64)))
+
+        for row in rows:
+            if not row or row[0].startswith("#"):
+                continue
+            if "_value" in row and "_time" in row and key in row:
+                key_index, time_index, value_index = row.index(key), row.index("_time"), row.index("_value")
+                continue
+            if value_index is None:
+                continue
+
+            try:
+                value = float(row[value_index])
+            except ValueError:
+                continue
+
+            times, values = pending.setdefault(row[key_index], ([], []))
+            times.append(row[time_index].rstrip("Z"))
+            values.append(value)
+            if len(values) >= chunk_size:
+                convert(row[key_index])
+
+        for name in list(pending):
+            convert(name)
+
+        return {name: (np.concatenate([times for times, _ in parts]), np.concatenate([values for _, values in parts]))
+                for name, parts in chunks.items()}
+
     def close(self):
         """
         Closes the connection to the InfluxDB client.
         This method ensures that the connection to the InfluxDB client is properly closed,
-        releasing any resources that were allocated for the connection.
+        releasing any resources that were allocated for the connection. In batching mode,
+        every buffered point is written before closing.
         """
 
+        if self.__queue is not None:
+            self.__queue.close()
+
+        if self.__replay_thread is not None:
+            self.__stop_replay.set()
+            self.__replay_thread.join()
+            self.__spool.close()
+            self.__replay_thread = None
+
         self.client.close()
 
     def __del__(self):
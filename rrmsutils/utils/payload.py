@@ -0,0 +1,510 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides the encoding used to store `Frame`, `Heatmap` and `HeatmapDelta` payloads in Redis streams.
+
+Two encodings are supported:
+
+- ``json``: The pydantic JSON dump of the model stored under the ``data`` field. This is the
+  default and the only format understood by older consumers.
+- ``binary``: A compact little-endian struct layout stored under the ``data`` field, together
+  with a ``format`` field holding the format marker (``rrbin1``).
+
+Frames can also be encoded straight from plain values and NumPy arrays with
+`encode_frame_values`, skipping the pydantic models. Its JSON output is byte-identical to
+``Frame.model_dump_json``.
+
+Consumers do not need to know which encoding a producer uses: `decode_payload` checks the
+``format`` field and falls back to JSON when it is missing.
+
+Heatmap streams written in delta mode carry a ``kind`` field set to ``delta``, detected with
+`is_heatmap_delta`. A `HeatmapDeltaDecoder` applies the decoded deltas in order and rebuilds
+the full heatmaps.
+
+Binary layout for a `Frame`:
+::
+
+    <q id> <i width> <i height> <I detections>
+    <H cameraid length> <cameraid utf-8>
+    <H timestamp length> <timestamp utf-8>
+    <H objectid length> * detections
+    <objectid utf-8> * detections
+    <i px> <i py> <i pz> <i dx> <i dy> <i dz> * detections
+
+Binary layout for a `Heatmap`:
+::
+
+    <I blobs>
+    <i x> <i y> <d intensity> <d radius> * blobs
+
+Binary layout for a `HeatmapDelta`:
+::
+
+    <q sequence> <B keyframe> <I added> <I changed> <I removed>
+    <I id> <i x> <i y> <d intensity> <d radius> * (added + changed)
+    <I id> * removed
+
+Coordinates are stored as 32-bit signed integers.
+
+Payloads of either encoding can optionally be compressed with ``zlib``, ``zstd`` or ``lz4``
+once they exceed a size threshold. Compressed entries carry a ``compression`` field naming
+the codec, so consumers decompress transparently. ``zstd`` and ``lz4`` require the
+``zstandard`` and ``lz4`` packages respectively.
+
+Example usage:
+::
+
+    from rrmsutils.utils.payload import BINARY, decode_payload, encode_payload
+
+    fields = encode_payload(frame, BINARY)
+    frame = decode_payload(fields, Frame)
+
+    fields = encode_payload(heatmap, JSON, compression="zlib", compression_threshold=1024)
+    heatmap = decode_payload(fields, Heatmap)
+
+    decoder = HeatmapDeltaDecoder()
+    if is_heatmap_delta(fields):
+        heatmap = decoder.apply(decode_payload(fields, HeatmapDelta))
+"""
+
+import json
+import re
+import struct
+import zlib
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.models.heatmap import Heatmap, HeatmapDelta
+
+JSON = "json"
+BINARY = "binary"
+
+BINARY_FORMAT = "rrbin1"
+
+_FRAME_HEADER = struct.Struct("<qiiI")
+_STR_LEN = struct.Struct("<H")
+_HEATMAP_HEADER = struct.Struct("<I")
+_BLOB = struct.Struct("<iidd")
+_DELTA_HEADER = struct.Struct("<qBIII")
+_IDENTIFIED_BLOB = struct.Struct("<Iiidd")
+_INT32 = np.iinfo(np.int32)
+
+_JSON_ESCAPE = re.compile(r'[\x00-\x1f"\\]')
+_DETECTION_JSON = '{"objectid":%s,"position":{"x":%d,"y":%d,"z":%d},"direction":{"x":%d,"y":%d,"z":%d}}'
+
+
+def _field(fields: dict, name: str):
+    """Gets a stream entry field regardless of the entry being decoded or raw"""
+    value = fields.get(name)
+    if value is None:
+        value = fields.get(name.encode())
+    return value
+
+
+def _compressor(name: str) -> tuple:
+    """Gets the compress and decompress functions of a codec, importing optional codecs lazily"""
+    if name == "zlib":
+        return lambda data: zlib.compress(data, 1), zlib.decompress
+
+    if name == "zstd":
+        import zstandard  # pylint: disable=import-outside-toplevel
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+
+    if name == "lz4":
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+        return lz4.frame.compress, lz4.frame.decompress
+
+    raise ValueError(f"Unsupported compression {name}")
+
+
+def _compress_fields(fields: dict, compression: str, compression_threshold: int) -> dict:
+    """Compresses the data field of a stream entry in place once it reaches the threshold"""
+    if compression:
+        compress, _ = _compressor(compression)
+        data = fields["data"]
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) >= compression_threshold:
+            fields["compression"] = compression
+            fields["data"] = compress(data)
+
+    return fields
+
+
+def _json_strings(values: list) -> list:
+    """Encodes strings as JSON string literals, only running the JSON encoder when some string needs escaping"""
+    if _JSON_ESCAPE.search("".join(values)) is None:
+        return ['"' + value + '"' for value in values]
+    return [json.dumps(value, ensure_ascii=False) for value in values]
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode()
+    return _STR_LEN.pack(len(raw)) + raw
+
+
+def _unpack_str(buffer: bytes, offset: int) -> tuple:
+    (length,) = _STR_LEN.unpack_from(buffer, offset)
+    offset += _STR_LEN.size
+    return buffer[offset:offset + length].decode(), offset + length
+
+
+def pack_frame(frame_id: int, cameraid: str, timestamp: str, width: int, height: int,
+               objectids: list, coordinates: list) -> bytes:
+    """Packs frame values into the binary layout
+
+    Args:
+        frame_id (int): The frame ID.
+        cameraid (str): The camera ID.
+        timestamp (str): The frame timestamp.
+        width (int): The frame width.
+        height (int): The frame height.
+        objectids (list): The object ID of every detection.
+        coordinates (list | np.ndarray): Flat list with px, py, pz, dx, dy, dz for every detection, or an
+                                         integer array of shape (N, 6) with the same values.
+
+    Raises:
+        struct.error: If a coordinate is not an integer or does not fit in 32 bits.
+
+    Returns:
+        bytes: The packed frame.
+    """
+    count = len(objectids)
+    raw_ids = [objectid.encode() for objectid in objectids]
+
+    if isinstance(coordinates, np.ndarray):
+        # Fail like struct.pack does instead of letting the cast wrap or truncate values
+        if coordinates.size and coordinates.dtype.kind not in "biu":
+            raise struct.error("required argument is not an integer")
+        if coordinates.size and (coordinates.min() < _INT32.min or coordinates.max() > _INT32.max):
+            raise struct.error(f"'i' format requires {_INT32.min} <= number <= {_INT32.max}")
+        packed_coordinates = coordinates.astype("<i4", copy=False).tobytes()
+    else:
+        packed_coordinates = struct.pack(f"<{6 * count}i", *coordinates)
+
+    return b"".join((
+        _FRAME_HEADER.pack(frame_id, width, height, count),
+        _pack_str(cameraid),
+        _pack_str(timestamp),
+        struct.pack(f"<{count}H", *[len(raw) for raw in raw_ids]),
+        b"".join(raw_ids),
+        packed_coordinates
+    ))
+
+
+def unpack_frame(buffer: bytes) -> tuple:
+    """Unpacks the binary layout into plain frame values
+
+    Args:
+        buffer (bytes): The packed frame.
+
+    Returns:
+        tuple: frame_id, cameraid, timestamp, width, height, objectids and the offset where
+        the detection coordinates start in the buffer.
+    """
+    frame_id, width, height, count = _FRAME_HEADER.unpack_from(buffer, 0)
+    offset = _FRAME_HEADER.size
+    cameraid, offset = _unpack_str(buffer, offset)
+    timestamp, offset = _unpack_str(buffer, offset)
+
+    lengths = struct.unpack_from(f"<{count}H", buffer, offset)
+    offset += 2 * count
+    objectids = []
+    for length in lengths:
+        objectids.append(buffer[offset:offset + length].decode())
+        offset += length
+
+    return frame_id, cameraid, timestamp, width, height, objectids, offset
+
+
+def frame_json(frame_id: int, cameraid: str, timestamp: str, width: int, height: int,
+               objectids: list, coordinates) -> str:
+    """Serializes frame values into the same JSON as `Frame.model_dump_json`, without building the models
+
+    Args:
+        frame_id (int): The frame ID.
+        cameraid (str): The camera ID.
+        timestamp (str): The frame timestamp.
+        width (int): The frame width.
+        height (int): The frame height.
+        objectids (list): The object ID of every detection.
+        coordinates (list | np.ndarray): Flat list with px, py, pz, dx, dy, dz for every detection, or an
+                                         integer array of shape (N, 6) with the same values.
+
+    Returns:
+        str: The JSON document.
+    """
+    count = len(objectids)
+    values = coordinates.ravel().tolist() if isinstance(coordinates, np.ndarray) else list(coordinates)
+
+    # Interleave the object IDs with their six coordinates to fill all the detections with one format call
+    flat = [None] * (7 * count)
+    flat[0::7] = _json_strings(objectids)
+    for i in range(6):
+        flat[i + 1::7] = values[i::6]
+
+    cameraid, timestamp = _json_strings([cameraid, timestamp])
+    return (f'{{"id":{int(frame_id)},"cameraid":{cameraid},'
+            f'"timestamp":{timestamp},"width":{int(width)},"height":{int(height)},'
+            f'"detections":[{",".join([_DETECTION_JSON] * count) % tuple(flat)}]}}')
+
+
+def _encode_frame(frame: Frame) -> bytes:
+    coordinates = []
+    for detection in frame.detections:
+        position = detection.position
+        direction = detection.direction
+        coordinates.extend((position.x, position.y, position.z,
+                            direction.x, direction.y, direction.z))
+
+    return pack_frame(frame.id, frame.cameraid, frame.timestamp, frame.width, frame.height,
+                      [detection.objectid for detection in frame.detections], coordinates)
+
+
+def _decode_frame(buffer: bytes) -> Frame:
+    frame_id, cameraid, timestamp, width, height, objectids, offset = unpack_frame(buffer)
+    coordinates = struct.unpack_from(f"<{6 * len(objectids)}i", buffer, offset)
+
+    detections = [
+        {"objectid": objectid,
+         "position": {"x": coordinates[6 * i], "y": coordinates[6 * i + 1], "z": coordinates[6 * i + 2]},
+         "direction": {"x": coordinates[6 * i + 3], "y": coordinates[6 * i + 4], "z": coordinates[6 * i + 5]}}
+        for i, objectid in enumerate(objectids)]
+
+    return Frame.model_validate({"id": frame_id, "cameraid": cameraid, "timestamp": timestamp,
+                                 "width": width, "height": height, "detections": detections})
+
+
+def _encode_heatmap(heatmap: Heatmap) -> bytes:
+    values = []
+    for blob in heatmap.heatmap:
+        values.extend((blob.position.x, blob.position.y, blob.intensity, blob.radius))
+
+    return _HEATMAP_HEADER.pack(len(heatmap.heatmap)) + struct.pack("<" + "iidd" * len(heatmap.heatmap), *values)
+
+
+def _decode_heatmap(buffer: bytes) -> Heatmap:
+    blobs = [{"position": {"x": x, "y": y}, "intensity": intensity, "radius": radius}
+             for x, y, intensity, radius in _BLOB.iter_unpack(buffer[_HEATMAP_HEADER.size:])]
+
+    return Heatmap.model_validate({"heatmap": blobs})
+
+
+def _encode_heatmap_delta(delta: HeatmapDelta) -> bytes:
+    blobs = delta.added + delta.changed
+    values = []
+    for blob in blobs:
+        values.extend((blob.id, blob.position.x, blob.position.y, blob.intensity, blob.radius))
+
+    return (_DELTA_HEADER.pack(delta.sequence, delta.keyframe, len(delta.added), len(delta.changed),
+                               len(delta.removed)) +
+            struct.pack("<" + "Iiidd" * len(blobs), *values) +
+            struct.pack(f"<{len(delta.removed)}I", *delta.removed))
+
+
+def _decode_heatmap_delta(buffer: bytes) -> HeatmapDelta:
+    sequence, keyframe, added, changed, removed = _DELTA_HEADER.unpack_from(buffer)
+    end = _DELTA_HEADER.size + _IDENTIFIED_BLOB.size * (added + changed)
+
+    blobs = [{"id": blob_id, "position": {"x": x, "y": y}, "intensity": intensity, "radius": radius}
+             for blob_id, x, y, intensity, radius in _IDENTIFIED_BLOB.iter_unpack(buffer[_DELTA_HEADER.size:end])]
+
+    return HeatmapDelta.model_validate({"sequence": sequence, "keyframe": bool(keyframe),
+                                        "added": blobs[:added], "changed": blobs[added:],
+                                        "removed": list(struct.unpack_from(f"<{removed}I", buffer, end))})
+
+
+_BINARY_CODECS = {
+    Frame: (_encode_frame, _decode_frame),
+    Heatmap: (_encode_heatmap, _decode_heatmap),
+    HeatmapDelta: (_encode_heatmap_delta, _decode_heatmap_delta),
+}
+
+
+def encode_payload(model, encoding: str = JSON, compression: str = None, compression_threshold: int = 1024) -> dict:
+    """Encodes a model into the fields of a stream entry
+
+    Args:
+        model (Frame | Heatmap | HeatmapDelta): The model to encode.
+        encoding (str, optional): Either JSON or BINARY. Defaults to JSON.
+        compression (str, optional): Compression codec, "zlib", "zstd" or "lz4". Defaults to None (no compression).
+        compression_threshold (int, optional): Payloads smaller than this number of bytes are not compressed.
+                                               Defaults to 1024.
+
+    Raises:
+        ValueError: If the encoding is not supported for the model or the compression is unknown.
+
+    Returns:
+        dict: The stream entry fields.
+    """
+    if encoding == JSON:
+        fields = {"data": model.model_dump_json()}
+    elif encoding == BINARY and type(model) in _BINARY_CODECS:
+        encode, _ = _BINARY_CODECS[type(model)]
+        fields = {"format": BINARY_FORMAT, "data": encode(model)}
+    else:
+        raise ValueError(f"Unsupported encoding {encoding} for {type(model).__name__}")
+
+    return _compress_fields(fields, compression, compression_threshold)
+
+
+def encode_frame_values(frame_id: int, cameraid: str, timestamp: str, width: int, height: int, objectids: list,
+                        coordinates, encoding: str = JSON, compression: str = None,
+                        compression_threshold: int = 1024) -> dict:
+    """Encodes frame values into the fields of a stream entry, producing the same fields as `encode_payload`
+    would for the equivalent `Frame`
+
+    The values are trusted: they are not validated, and coordinates must be integers.
+
+    Args:
+        frame_id (int): The frame ID.
+        cameraid (str): The camera ID.
+        timestamp (str): The frame timestamp.
+        width (int): The frame width.
+        height (int): The frame height.
+        objectids (list): The object ID of every detection.
+        coordinates (list | np.ndarray): Flat list with px, py, pz, dx, dy, dz for every detection, or an
+                                         integer array of shape (N, 6) with the same values.
+        encoding (str, optional): Either JSON or BINARY. Defaults to JSON.
+        compression (str, optional): Compression codec, "zlib", "zstd" or "lz4". Defaults to None (no compression).
+        compression_threshold (int, optional): Payloads smaller than this number of bytes are not compressed.
+                                               Defaults to 1024.
+
+    Raises:
+        ValueError: If the encoding or the compression is unknown.
+
+    Returns:
+        dict: The stream entry fields.
+    """
+    if encoding == JSON:
+        fields = {"data": frame_json(frame_id, cameraid, timestamp, width, height, objectids, coordinates)}
+    elif encoding == BINARY:
+        fields = {"format": BINARY_FORMAT,
+                  "data": pack_frame(frame_id, cameraid, timestamp, width, height, objectids, coordinates)}
+    else:
+        raise ValueError(f"Unsupported encoding {encoding} for Frame")
+
+    return _compress_fields(fields, compression, compression_threshold)
+
+
+def read_payload(fields: dict) -> tuple:
+    """Extracts the payload of a stream entry, decompressing it if needed
+
+    Args:
+        fields (dict): The stream entry fields, either decoded or raw.
+
+    Raises:
+        ValueError: If the compression is unknown.
+
+    Returns:
+        tuple: The payload data and its format marker, None for JSON payloads.
+    """
+    data = _field(fields, "data")
+    payload_format = _field(fields, "format")
+    compression = _field(fields, "compression")
+
+    if compression is not None:
+        if isinstance(compression, bytes):
+            compression = compression.decode()
+        _, decompress = _compressor(compression)
+        data = decompress(data)
+
+    if isinstance(payload_format, bytes):
+        payload_format = payload_format.decode()
+
+    return data, payload_format
+
+
+def decode_payload(fields: dict, model_type):
+    """Decodes the fields of a stream entry into a model, detecting the encoding and compression automatically
+
+    Args:
+        fields (dict): The stream entry fields, either decoded or raw.
+        model_type (type): The expected model type, Frame, Heatmap or HeatmapDelta.
+
+    Raises:
+        ValueError: If the format marker or the compression is unknown.
+
+    Returns:
+        Frame | Heatmap | HeatmapDelta: The decoded model.
+    """
+    data, payload_format = read_payload(fields)
+
+    if payload_format is None:
+        return model_type.model_validate_json(data)
+
+    if payload_format == BINARY_FORMAT and model_type in _BINARY_CODECS:
+        _, decode = _BINARY_CODECS[model_type]
+        return decode(data)
+
+    raise ValueError(f"Unsupported payload format {payload_format}")
+
+
+def is_heatmap_delta(fields: dict) -> bool:
+    """Checks whether a stream entry holds a `HeatmapDelta`
+
+    Args:
+        fields (dict): The stream entry fields, either decoded or raw.
+
+    Returns:
+        bool: True for delta entries, False for full heatmaps.
+    """
+    return _field(fields, "kind") in ("delta", b"delta")
+
+
+class HeatmapDeltaDecoder:
+    """Rebuilds full heatmaps from a sequence of `HeatmapDelta` models
+    """
+
+    def __init__(self):
+        """
+        Initializes the decoder. Deltas are discarded until the first keyframe.
+        """
+        self.__blobs = None
+        self.__sequence = None
+
+    def apply(self, delta: HeatmapDelta) -> Heatmap:
+        """Apply a delta to the rebuilt heatmap
+
+        Args:
+            delta (HeatmapDelta): The delta following the previously applied one.
+
+        Returns:
+            Heatmap: The rebuilt heatmap, with `IdentifiedBlob` blobs in the order they first appeared, or None
+                     until the next keyframe when there is no base or a delta was missed. Rebuilt heatmaps share
+                     their blobs with the following heatmaps, so they must not be modified.
+        """
+        if delta.keyframe:
+            self.__blobs = {}
+        elif self.__blobs is None or delta.sequence != self.__sequence + 1:
+            self.__blobs = None
+            return None
+
+        blobs = self.__blobs
+        for blob_id in delta.removed:
+            blobs.pop(blob_id, None)
+        for blob in delta.added + delta.changed:
+            blobs[blob.id] = blob
+        self.__sequence = delta.sequence
+
+        return Heatmap.model_construct(heatmap=list(blobs.values()))
+
+    def copy(self) -> "HeatmapDeltaDecoder":
+        """Copy the decoder state, for example to roll back deltas that must be applied again
+
+        Returns:
+            HeatmapDeltaDecoder: An independent decoder in the same state.
+        """
+        decoder = HeatmapDeltaDecoder()
+        decoder.__blobs = None if self.__blobs is None else dict(self.__blobs)
+        decoder.__sequence = self.__sequence
+        return decoder
@@ -0,0 +1,52 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides the conversion of position-like inputs into NumPy point arrays, shared by
+the vectorized heatmap, ROI and ray casting utilities.
+
+Positions arrive as NumPy arrays, lists of tuples, or empty lists for frames without
+detections. `as_points` turns all of them into a float64 array with one row per point, and
+gives empty inputs the expected number of columns so callers can slice them like any other
+input.
+
+Example usage:
+::
+
+    from rrmsutils.utils.points import as_points
+
+    positions = as_points([(detection.position.x, detection.position.y) for detection in frame.detections])
+    x, y = positions[:, 0], positions[:, 1]
+"""
+
+import numpy as np
+
+
+def as_points(values, columns: int = None) -> np.ndarray:
+    """Convert positions to a float64 array with one row per point
+
+    Args:
+        values (np.ndarray | list): The positions, an array of shape (N, D) or a list of N sequences. Empty
+                                    inputs are accepted.
+        columns (int, optional): The number of coordinates per point. Defaults to None (the number of
+                                 coordinates of the input, 2 for empty inputs).
+
+    Returns:
+        np.ndarray: Array of shape (N, columns).
+    """
+    points = np.asarray(values, dtype=np.float64)
+    if points.size == 0:
+        if columns is None:
+            columns = points.shape[1] if points.ndim == 2 else 2
+        return np.zeros((0, columns))
+
+    if columns is None:
+        return points.reshape(len(points), -1)
+    return points.reshape(-1, columns)
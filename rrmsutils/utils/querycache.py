@@ -0,0 +1,149 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a cache for repeated, windowed InfluxDB range queries.
+
+Dashboards re-run the same aggregated range query every few seconds although only the most
+recent aggregation window changes. The QueryCache keeps the records of closed windows, queries
+only the windows it has not seen yet plus the open tail window, and stitches the results
+together. Entries are evicted in least recently used order.
+
+Points can reach InfluxDB late, for example from batched writes, a replayed spool or a retried
+stream bridge batch. Windows are therefore only cached once they ended more than `grace`
+seconds ago. Newer windows are queried again on every run.
+
+The query is given as a Flux template with ``{start}`` and ``{stop}`` placeholders, which are
+replaced by RFC3339 times. The template must aggregate with ``aggregateWindow(every: ...)``
+using the same period passed to `QueryCache.query` and the default ``timeSrc: "_stop"``, so
+every record is stamped with the end of its window.
+
+Example usage:
+::
+
+    cache = QueryCache(influx_client, max_entries=64, grace=120)
+
+    template = '''
+    from(bucket: "engagement")
+    |> range(start: {start}, stop: {stop})
+    |> filter(fn: (r) => r["_measurement"] == "people")
+    |> aggregateWindow(every: 1m, fn: mean)
+    '''
+
+    # Last hour, in one minute windows
+    records = cache.query(template, start=time.time() - 3600, every=60)
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from rrmsutils.utils.influxdb import InfluxDB
+
+
+def _rfc3339(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class _Entry:
+    """Closed windows cached for a template and aggregation period"""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.closed_until = start
+        self.records = []
+
+
+class QueryCache:
+    """Time-window aware cache for InfluxDB queries
+    """
+
+    def __init__(self, influx: InfluxDB, max_entries: int = 128, grace: float = 60, clock=time.time):
+        """
+        Initializes the cache.
+
+        Args:
+            influx (InfluxDB): The client used to run the queries.
+            max_entries (int, optional): The maximum number of cached queries. Defaults to 128.
+            grace (float, optional): The time in seconds points may arrive late. Windows are only cached once
+                                     they ended this long ago. Defaults to 60.
+            clock (callable, optional): Returns the current time in seconds since the epoch. Defaults to time.time.
+        """
+        self.__influx = influx
+        self.__max_entries = max_entries
+        self.__grace = grace
+        self.__clock = clock
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __run(self, template: str, start: float, stop: float) -> list:
+        query = template.replace("{start}", _rfc3339(start)).replace("{stop}", _rfc3339(stop))
+        records = [record for table in self.__influx.query_data(query) for record in table.records]
+        return sorted(((record.get_time().timestamp(), record) for record in records), key=lambda item: item[0])
+
+    def query(self, template: str, start: float, stop: float = None, every: float = 60) -> list:
+        """Run a windowed range query, reusing the closed windows of previous runs
+
+        Args:
+            template (str): The Flux query with {start} and {stop} placeholders.
+            start (float): The range start in seconds since the epoch. It is aligned down to the window period.
+            stop (float, optional): The range stop in seconds since the epoch. Defaults to None (now).
+            every (float, optional): The aggregation window period in seconds. Defaults to 60.
+
+        Returns:
+            list: The FluxRecords of the range, sorted by time.
+        """
+        now = self.__clock()
+        stop = now if stop is None else stop
+        start = math.floor(start / every) * every
+        boundary = max(start, math.floor(min(stop, now - self.__grace) / every) * every)
+        key = (template, every)
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or not entry.start <= start <= entry.closed_until:
+                entry = _Entry(start)
+                self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+            # Drop windows the sliding range no longer covers
+            if start > entry.start:
+                entry.records = [item for item in entry.records if item[0] > start]
+                entry.start = start
+
+            closed_until = entry.closed_until
+            closed = [record for timestamp, record in entry.records if start < timestamp <= boundary]
+
+        if boundary > closed_until:
+            # Queried without the lock, so a slow query does not hold back other callers
+            new = [item for item in self.__run(template, closed_until, boundary) if item[0] <= boundary]
+            closed.extend(record for _, record in new)
+
+            with self.__lock:
+                # Another caller may have stored the same windows, or evicted the entry, in the meantime
+                if self.__entries.get(key) is entry and entry.closed_until == closed_until:
+                    entry.records.extend(item for item in new if item[0] > entry.start)
+                    entry.closed_until = boundary
+
+        tail = []
+        if stop > boundary:
+            tail = [record for _, record in self.__run(template, boundary, stop)]
+
+        return closed + tail
+
+    def clear(self):
+        """Remove every cached query
+        """
+        with self.__lock:
+            self.__entries.clear()
@@ -0,0 +1,283 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a vectorized engine that tells whether detections are facing an
+engagement ROI or a display, by casting a ray from the position of every detection along its
+direction.
+
+A RayTarget is a planar polygon: the ROI of an `Engagement`, or a display given by a corner and
+the vectors along its width and height. Rays are intersected with the plane of the polygon, and
+the intersection points are tested against the polygon with a `CompiledROI` in the plane
+coordinates. Rays lying in the plane of the target, like the positions and headings of a flat
+floor plan against an ROI of the same floor plan, hit the polygon where they first cross it, or
+at their origin when they start inside.
+
+The RayCaster intersects many targets at once and keeps the closest hit of every ray.
+
+Results carry the hit points both in 3D and in the 2D coordinates of the target, measured from
+its first vertex along its first edge, so gaze points on a display can be accumulated directly
+into a heatmap of the display.
+
+Example usage:
+::
+
+    from rrmsutils.utils.raycasting import RayCaster, RayTarget
+
+    display = RayTarget.rectangle("display", origin=(0, 0, 200), u=(1920, 0, 0), v=(0, 0, -1080))
+    caster = RayCaster([display] + [RayTarget.from_engagement(engagement)
+                                    for engagement in configuration.engagement])
+
+    hits = caster.cast_frame(frame)
+    for detection, target in zip(frame.detections, hits.targets):
+        if target >= 0:
+            print(detection.objectid, "faces", caster.targets[target].id)
+
+    display_hits = display.intersect(batch.all_detections.positions, batch.all_detections.directions)
+    accumulator.add(display_hits.local[display_hits.hits])
+"""
+
+from typing import List
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.configuration import Engagement
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.utils.points import as_points
+from rrmsutils.utils.roi import CompiledROI
+
+# Numerical tolerance: rays closer to parallel than this (cosine of the angle to the plane normal) do not cross
+# the plane, and rays in the plane passing this close to a vertex, as a fraction of the edge, hit it
+_TOLERANCE = 1e-9
+
+
+class RayHits:
+    """
+    Result of casting N rays.
+
+    Attributes:
+        hits (np.ndarray): Boolean array of shape (N,), True for the rays hitting a target.
+        distances (np.ndarray): Array of shape (N,) with the distance from every ray origin to its hit, inf for misses.
+        points (np.ndarray): Array of shape (N, 3) with the hit points, NaN for misses.
+        local (np.ndarray): Array of shape (N, 2) with the hit points in the coordinates of the hit target,
+                            NaN for misses.
+        targets (np.ndarray): Array of shape (N,) with the index of the hit target in the caster, -1 for misses.
+                              None for the results of a single target.
+    """
+
+    def __init__(self, hits: np.ndarray, distances: np.ndarray, points: np.ndarray, local: np.ndarray,
+                 targets: np.ndarray = None):
+        self.hits = hits
+        self.distances = distances
+        self.points = points
+        self.local = local
+        self.targets = targets
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+
+class RayTarget:
+    """Planar polygon target
+    """
+
+    def __init__(self, target_id: str, vertices):
+        """
+        Initializes the target.
+
+        Args:
+            target_id (str): The target identifier.
+            vertices (np.ndarray): Array of shape (K, 3) with the polygon vertices, in order. The polygon is
+                                   assumed planar.
+        """
+        vertices = as_points(vertices)
+        if vertices.shape[1] == 2:
+            vertices = np.hstack((vertices, np.zeros((len(vertices), 1))))
+
+        self.id = target_id
+        self.vertices = vertices
+        self.__origin = vertices[0] if len(vertices) else np.zeros(3)
+
+        # Newell's method gives the normal of any simple polygon, whatever its orientation
+        following = np.roll(vertices, -1, axis=0)
+        normal = np.array([np.sum((vertices[:, 1] - following[:, 1]) * (vertices[:, 2] + following[:, 2])),
+                           np.sum((vertices[:, 2] - following[:, 2]) * (vertices[:, 0] + following[:, 0])),
+                           np.sum((vertices[:, 0] - following[:, 0]) * (vertices[:, 1] + following[:, 1]))])
+        length = np.linalg.norm(normal)
+        self.__valid = len(vertices) >= 3 and length > 0
+        if not self.__valid:
+            return
+
+        self.__normal = normal / length
+        edges = following - vertices
+        first = edges[np.argmax(np.linalg.norm(edges, axis=1) > 0)]
+        self.__u = first / np.linalg.norm(first)
+        self.__v = np.cross(self.__normal, self.__u)
+
+        local = self.__project(vertices)
+        self.__roi = CompiledROI(target_id, local)
+        self.__edges_start = local
+        self.__edges = np.roll(local, -1, axis=0) - local
+        self.__tolerance = 1e-9 * max(1.0, float(np.abs(vertices).max()))
+
+    @classmethod
+    def from_engagement(cls, engagement: Engagement) -> "RayTarget":
+        """Create a target from the ROI of an engagement
+
+        Args:
+            engagement (Engagement): The engagement.
+
+        Returns:
+            RayTarget: The target, with the engagement ID.
+        """
+        return cls(engagement.id, [(point.x, point.y, point.z) for point in engagement.roi])
+
+    @classmethod
+    def rectangle(cls, target_id: str, origin, u, v) -> "RayTarget":
+        """Create a rectangular target, like a display
+
+        Args:
+            target_id (str): The target identifier.
+            origin (tuple): The (x, y, z) corner of the rectangle.
+            u (tuple): The vector from the corner along the width of the rectangle.
+            v (tuple): The vector from the corner along the height of the rectangle.
+
+        Returns:
+            RayTarget: The target. Its local coordinates are the distances along u and v from the corner.
+        """
+        origin, u, v = (np.asarray(vector, dtype=np.float64) for vector in (origin, u, v))
+        return cls(target_id, [origin, origin + u, origin + u + v, origin + v])
+
+    def __project(self, points: np.ndarray) -> np.ndarray:
+        """Gets the coordinates of points in the plane of the target"""
+        relative = points - self.__origin
+        return np.stack((relative @ self.__u, relative @ self.__v), axis=1)
+
+    def __coplanar(self, origins: np.ndarray, directions: np.ndarray) -> tuple:
+        """Gets the closest hit of rays lying in the plane of the target, as plane distances and local points"""
+        start = self.__project(origins)
+        heading = np.stack((directions @ self.__u, directions @ self.__v), axis=1)
+
+        # Solve start + t * heading = edge start + s * edge for every ray and edge
+        offset = self.__edges_start[None, :, :] - start[:, None, :]
+        denominator = heading[:, None, 0] * self.__edges[None, :, 1] - heading[:, None, 1] * self.__edges[None, :, 0]
+        parallel = denominator == 0
+        denominator = np.where(parallel, 1, denominator)
+        t = (offset[:, :, 0] * self.__edges[None, :, 1] - offset[:, :, 1] * self.__edges[None, :, 0]) / denominator
+        s = (offset[:, :, 0] * heading[:, None, 1] - offset[:, :, 1] * heading[:, None, 0]) / denominator
+        t = np.where(~parallel & (t >= 0) & (s >= -_TOLERANCE) & (s <= 1 + _TOLERANCE), t, np.inf)
+        t = t.min(axis=1, initial=np.inf)
+
+        inside = self.__roi.contains(start)
+        t[inside] = 0
+        return t, start + np.where(np.isfinite(t), t, 0)[:, None] * heading
+
+    def intersect(self, positions, directions) -> RayHits:
+        """Intersect rays with the target
+
+        Args:
+            positions (np.ndarray): Array of shape (N, 3) with the ray origins.
+            directions (np.ndarray): Array of shape (N, 3) with the ray directions. Null directions never hit.
+
+        Returns:
+            RayHits: The hits, without target indices.
+        """
+        origins = as_points(positions, 3)
+        directions = as_points(directions, 3)
+        count = len(origins)
+
+        t = np.full(count, np.inf)
+        local = np.full((count, 2), np.nan)
+        norms = np.linalg.norm(directions, axis=1)
+        if self.__valid and count:
+            moving = norms > 0
+            heights = (origins - self.__origin) @ self.__normal
+            denominators = directions @ self.__normal
+            crossing = moving & (np.abs(denominators) > _TOLERANCE * norms)
+
+            # Rays crossing the plane hit it once, inside or outside the polygon
+            index = np.flatnonzero(crossing)
+            plane_t = -heights[index] / denominators[index]
+            ahead = plane_t >= 0
+            index, plane_t = index[ahead], plane_t[ahead]
+            plane_local = self.__project(origins[index] + plane_t[:, None] * directions[index])
+            inside = self.__roi.contains(plane_local)
+            t[index[inside]] = plane_t[inside]
+            local[index[inside]] = plane_local[inside]
+
+            # Rays lying in the plane hit the polygon edges, or start inside it
+            index = np.flatnonzero(moving & ~crossing & (np.abs(heights) <= self.__tolerance))
+            if len(index):
+                plane_t, plane_local = self.__coplanar(origins[index], directions[index])
+                found = np.isfinite(plane_t)
+                t[index[found]] = plane_t[found]
+                local[index[found]] = plane_local[found]
+
+        hits = np.isfinite(t)
+        points = np.full((count, 3), np.nan)
+        points[hits] = origins[hits] + t[hits, None] * directions[hits]
+        distances = np.full(count, np.inf)
+        distances[hits] = t[hits] * norms[hits]
+        return RayHits(hits, distances, points, local)
+
+
+class RayCaster:
+    """Closest hit ray caster over many targets
+    """
+
+    def __init__(self, targets: List[RayTarget]):
+        """
+        Initializes the caster.
+
+        Args:
+            targets (List[RayTarget]): The targets.
+        """
+        self.targets = list(targets)
+
+    def cast(self, positions, directions) -> RayHits:
+        """Intersect rays with every target, keeping the closest hit of each ray
+
+        Args:
+            positions (np.ndarray): Array of shape (N, 3) with the ray origins.
+            directions (np.ndarray): Array of shape (N, 3) with the ray directions.
+
+        Returns:
+            RayHits: The hits, with the index of the hit target of every ray.
+        """
+        positions = as_points(positions, 3)
+        count = len(positions)
+
+        distances = np.full(count, np.inf)
+        points = np.full((count, 3), np.nan)
+        local = np.full((count, 2), np.nan)
+        targets = np.full(count, -1, dtype=np.int64)
+        for index, target in enumerate(self.targets):
+            hits = target.intersect(positions, directions)
+            closer = hits.distances < distances
+            distances[closer] = hits.distances[closer]
+            points[closer] = hits.points[closer]
+            local[closer] = hits.local[closer]
+            targets[closer] = index
+
+        return RayHits(targets >= 0, distances, points, local, targets)
+
+    def cast_frame(self, frame: Frame) -> RayHits:
+        """Intersect the rays of the detections of a frame with every target
+
+        Args:
+            frame (Frame): The frame.
+
+        Returns:
+            RayHits: The hits, one per detection.
+        """
+        coordinates = as_points([(detection.position.x, detection.position.y, detection.position.z,
+                                  detection.direction.x, detection.direction.y, detection.direction.z)
+                                 for detection in frame.detections], 6)
+        return self.cast(coordinates[:, :3], coordinates[:, 3:])
@@ -12,8 +12,13 @@
 This module provides a Redis client utility class for interacting with a Redis server.
 
 The RedisClient class includes methods for setting and getting key-value pairs, setting
-and getting dictionaries, incrementing fields, writing to and reading from Redis streams,
-and checking if a key exists.
+and getting dictionaries, incrementing fields (one at a time or in atomic batches), writing
+to and reading from Redis streams, and checking if a key exists.
+
+Reads from `get`, `get_dict` and `exists` can optionally be served from a local LRU cache.
+The cache uses Redis server-assisted client-side caching (RESP3 client tracking): the server
+notifies the client whenever a cached key changes, so cached values are never stale. It
+requires redis-py 5.1 or newer and a Redis 6 or newer server.
 
 Example usage:
 ::
@@ -22,18 +27,115 @@ Example usage:
     redis_client.set("key", "value")
     value = redis_client.get("key")
     exists = redis_client.exists("key")
+
+    # Clients of the same server in this process share one connection pool
+    shared_client = RedisClient(shared_pool=True)
+
+    cached_client = RedisClient(cache_size=10000)
+    value = cached_client.get("key")
+
+    # Keep the last 30 seconds of a stream regardless of its frame rate
+    redis_client.write_to_stream("detection", {"data": "..."}, retention=30)
+
+    # Or size the stream length from its measured publish rate
+    maxlen = maxlen_for_window(redis_client.measure_stream_rate("detection"), window=30)
 """
 
 import logging
+import math
+import numbers
+import threading
+import time
+
+from redis import ConnectionPool, Redis
+
+
+# Increments hash fields on many keys and refreshes their TTL atomically.
+# KEYS: the hashes. ARGV: for every key its ttl and number of fields, followed by field/increment pairs.
+_INCREMENT_FIELDS_SCRIPT = """
+local pos = 1
+for _, key in ipairs(KEYS) do
+    local ttl = tonumber(ARGV[pos])
+    local count = tonumber(ARGV[pos + 1])
+    pos = pos + 2
+    for _ = 1, count do
+        local increment = ARGV[pos + 1]
+        if string.find(increment, '[.eE]') then
+            redis.call('HINCRBYFLOAT', key, ARGV[pos], increment)
+        else
+            redis.call('HINCRBY', key, ARGV[pos], increment)
+        end
+        pos = pos + 2
+    end
+    if ttl > 0 then
+        redis.call('EXPIRE', key, ttl)
+    end
+end
+return #KEYS
+"""
 
-from redis import Redis
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def shared_connection_pool(host: str = 'localhost', port: int = 6379, decode_responses: bool = True) -> ConnectionPool:
+    """Get the connection pool shared by every client of a server in this process
+
+    Args:
+        host (str): The hostname of the Redis server. Defaults to 'localhost'.
+        port (int): The port number on which the Redis server is listening. Defaults to 6379.
+        decode_responses (bool, optional): Decode responses into strings. Defaults to True.
+
+    Returns:
+        ConnectionPool: The pool, created on first use.
+    """
+    key = (host, port, decode_responses)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(host=host, port=port, decode_responses=decode_responses)
+            _POOLS[key] = pool
+        return pool
+
+
+def _trim_args(maxlen: int, retention: float = None) -> dict:
+    """Builds the XADD trimming arguments for either a length or a time based retention"""
+    if retention is None:
+        return {"maxlen": maxlen}
+
+    minid = int((time.time() - retention) * 1000)
+    return {"minid": f"{max(minid, 0)}-0"}
+
+
+def _id_millis(entry_id) -> int:
+    """Extracts the millisecond timestamp of a stream entry ID"""
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    return int(entry_id.split("-")[0])
+
+
+def maxlen_for_window(rate: float, window: float, headroom: float = 1.2) -> int:
+    """Size a stream maxlen so it holds a target time window
+
+    Args:
+        rate (float): The publish rate of the stream in entries per second, as measured by
+                      `RedisClient.measure_stream_rate`.
+        window (float): The time window to retain in seconds.
+        headroom (float, optional): Safety factor for rate fluctuations. Defaults to 1.2.
+
+    Returns:
+        int: The maxlen to pass to `RedisClient.write_to_stream`, at least 1.
+    """
+    return max(1, math.ceil(rate * window * headroom))
 
 
 class RedisClient:
     """Redis client
     """
 
-    def __init__(self, host: str = 'localhost', port: int = 6379, logger=None):
+    def __init__(self, host: str = 'localhost', port: int = 6379, logger=None, decode_responses: bool = True,
+                 cache_size: int = 0, shared_pool: bool = False):
         """
         Initializes a new instance of the Redis utility class.
 
@@ -41,9 +143,26 @@ class RedisClient:
             host (str): The hostname of the Redis server. Defaults to 'localhost'.
             port (int): The port number on which the Redis server is listening. Defaults to 6379.
             logger (logging.Logger, optional): The logger instance to log messages. Defaults to None.
+            decode_responses (bool, optional): Decode responses into strings. Set to False to read
+                                               binary values as bytes. Defaults to True.
+            cache_size (int, optional): Maximum number of entries in the client-side read cache. The least
+                                        recently used entries are evicted first. Defaults to 0 (disabled).
+            shared_pool (bool, optional): Use the connection pool shared by every client of the same server
+                                          instead of a private one. Ignored when the cache is enabled.
+                                          Defaults to False.
         """
 
-        self._redis = Redis(host=host, port=port, decode_responses=True)
+        cache_args = {}
+        if cache_size > 0:
+            # Only available in redis-py 5.1 and newer
+            from redis.cache import CacheConfig  # pylint: disable=import-outside-toplevel
+            cache_args = {"protocol": 3, "cache_config": CacheConfig(max_size=cache_size)}
+
+        if shared_pool and not cache_args:
+            self._redis = Redis(connection_pool=shared_connection_pool(host, port, decode_responses))
+        else:
+            self._redis = Redis(host=host, port=port, decode_responses=decode_responses, **cache_args)
+        self._increment_fields_script = self._redis.register_script(_INCREMENT_FIELDS_SCRIPT)
         self.logger = logger or logging.getLogger(__name__)
 
     def set(self, key: str, value: str, ex: int = None) -> bool:
@@ -156,7 +275,45 @@ class RedisClient:
             self.logger.error("Error incrementing field in Redis: %s", e)
             return False
 
-    def write_to_stream(self, stream: str, data: dict, maxlen: int = 1000) -> bool:
+    def increment_fields(self, counters: dict, ex=None) -> bool:
+        """Increment many fields of many keys atomically in a single round-trip
+
+        The increments run in a server-side Lua script invoked with EVALSHA. The script is
+        cached by its SHA and reloaded automatically if the server replies with NOSCRIPT.
+
+        Args:
+            counters (dict): A dictionary mapping each key to a dictionary of field increments.
+                             Integer increments use HINCRBY and float increments use HINCRBYFLOAT.
+                             NumPy integer and floating point scalars are accepted too.
+            ex (int | dict, optional): The expiration time in seconds applied to every key, or a dictionary
+                                       mapping keys to their expiration time. Keys without one do not expire.
+                                       Defaults to None.
+
+        Returns:
+            bool: True if the fields were incremented successfully, False otherwise.
+        """
+        keys = []
+        args = []
+        for key, fields in counters.items():
+            keys.append(key)
+            ttl = ex.get(key) if isinstance(ex, dict) else ex
+            args.extend((ttl or 0, len(fields)))
+            for field, value in fields.items():
+                # NumPy scalars are converted to Python numbers, which redis-py encodes and the script parses
+                if isinstance(value, numbers.Integral):
+                    value = int(value)
+                elif isinstance(value, numbers.Real):
+                    value = repr(float(value))
+                args.extend((field, value))
+
+        try:
+            self._increment_fields_script(keys=keys, args=args)
+            return True
+        except Exception as e:
+            self.logger.error("Error incrementing fields in Redis: %s", e)
+            return False
+
+    def write_to_stream(self, stream: str, data: dict, maxlen: int = 1000, retention: float = None) -> bool:
         """Write data to a Redis stream
 
         Args:
@@ -164,16 +321,68 @@ class RedisClient:
             data (dict): The data to write to the stream
             maxlen (int): The maximum number of entries to keep in the stream. Older entries will be trimmed
                           automatically if the stream exceeds this length. The trimming is approximate for performance reasons.
+            retention (float, optional): When set, trim entries older than this number of seconds instead of using maxlen.
+                                         The trimming is approximate and uses the local clock. Defaults to None.
         Returns:
             bool: True if the data was written successfully, False otherwise.
         """
         try:
-            self._redis.xadd(stream, data, maxlen=maxlen, approximate=True)
+            self._redis.xadd(stream, data, approximate=True, **_trim_args(maxlen, retention))
             return True
         except Exception as e:
             self.logger.error("Error writing to stream in Redis: %s", e)
             return False
 
+    def write_many_to_stream(self, entries: list) -> bool:
+        """Write several entries to Redis streams in a single pipelined round-trip
+
+        Args:
+            entries (list): A list of (stream, data, maxlen) or (stream, data, maxlen, retention) tuples,
+                            with the same meaning as the arguments of `write_to_stream`.
+        Returns:
+            bool: True if all the entries were written successfully, False otherwise.
+        """
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for stream, data, maxlen, *retention in entries:
+                pipeline.xadd(stream, data, approximate=True, **_trim_args(maxlen, *retention))
+            pipeline.execute()
+            return True
+        except Exception as e:
+            self.logger.error("Error writing to stream in Redis: %s", e)
+            return False
+
+    def measure_stream_rate(self, stream: str) -> float:
+        """Measure the rate at which entries are published to a stream
+
+        The rate is estimated from the length of the stream and the timestamps of its oldest
+        and newest entry IDs, so it only holds for streams using auto-generated IDs.
+
+        Args:
+            stream (str): The name of the stream
+
+        Returns:
+            float: The publish rate in entries per second, or 0.0 if it cannot be measured.
+        """
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.xlen(stream)
+            pipeline.xrange(stream, count=1)
+            pipeline.xrevrange(stream, count=1)
+            length, first, last = pipeline.execute()
+        except Exception as e:
+            self.logger.error("Error measuring stream rate in Redis: %s", e)
+            return 0.0
+
+        if length < 2:
+            return 0.0
+
+        elapsed = (_id_millis(last[0][0]) - _id_millis(first[0][0])) / 1000
+        if elapsed <= 0:
+            return 0.0
+
+        return (length - 1) / elapsed
+
     def read_from_stream(self, stream: str, count: int = 1, block: int = 0, last_id: str = '0-0') -> tuple:
         """Read data from a Redis stream
 
@@ -189,6 +398,9 @@ class RedisClient:
         try:
             entries = self._redis.xread(
                 {stream: last_id}, count=count, block=block)
+            if isinstance(entries, dict):
+                # RESP3 replies map stream names to entries
+                entries = [[name, messages] for name, messages in entries.items()]
             if entries:
                 last_id = entries[0][1][-1][0]
             return entries, last_id
@@ -196,6 +408,71 @@ class RedisClient:
             self.logger.error("Error reading from stream in Redis: %s", e)
             return [], last_id
 
+    def create_group(self, stream: str, group: str, last_id: str = '$') -> bool:
+        """Create a consumer group on a stream, creating the stream if needed
+
+        Args:
+            stream (str): The name of the stream
+            group (str): The name of the consumer group
+            last_id (str, optional): The ID after which the group starts reading. Defaults to '$' (new entries only).
+
+        Returns:
+            bool: True if the group exists after the call, False otherwise.
+        """
+        try:
+            self._redis.xgroup_create(stream, group, id=last_id, mkstream=True)
+            return True
+        except Exception as e:
+            if "BUSYGROUP" in str(e):
+                return True
+            self.logger.error("Error creating consumer group in Redis: %s", e)
+            return False
+
+    def read_group(self, streams: list, group: str, consumer: str, count: int = 1, block: int = 0,
+                   pending: bool = False) -> list:
+        """Read entries from several streams as a member of a consumer group
+
+        Args:
+            streams (list): The names of the streams
+            group (str): The name of the consumer group
+            consumer (str): The name of this consumer within the group
+            count (int, optional): The maximum number of entries to read per stream. Defaults to 1.
+            block (int, optional): The maximum number of milliseconds to block if no entries are available. Defaults to 0.
+            pending (bool, optional): Read the entries already delivered to this consumer but not acknowledged,
+                                      instead of new entries. Defaults to False.
+
+        Returns:
+            list: A list of [stream, [(id, data), ...]] pairs, empty on timeout or error.
+        """
+        try:
+            entries = self._redis.xreadgroup(group, consumer, {stream: '0' if pending else '>' for stream in streams},
+                                             count=count, block=None if pending else block)
+            if isinstance(entries, dict):
+                entries = [[name, messages] for name, messages in entries.items()]
+            return entries or []
+        except Exception as e:
+            self.logger.error("Error reading from consumer group in Redis: %s", e)
+            return []
+
+    def ack(self, stream: str, group: str, ids: list) -> bool:
+        """Acknowledge entries read from a consumer group
+
+        Args:
+            stream (str): The name of the stream
+            group (str): The name of the consumer group
+            ids (list): The IDs of the processed entries
+
+        Returns:
+            bool: True if the entries were acknowledged, False otherwise.
+        """
+        try:
+            if ids:
+                self._redis.xack(stream, group, *ids)
+            return True
+        except Exception as e:
+            self.logger.error("Error acknowledging stream entries in Redis: %s", e)
+            return False
+
     def exists(self, key: str) -> bool:
         """Check if a key exists in Redis
 
@@ -210,3 +487,10 @@ class RedisClient:
         except Exception as e:
             self.logger.error("Error checking if key exists in Redis: %s", e)
             return False
+
+    def clear_cache(self):
+        """Remove every entry from the client-side read cache, if enabled
+        """
+        cache = self._redis.get_cache() if hasattr(self._redis, "get_cache") else None
+        if cache is not None:
+            cache.flush()
@@ -0,0 +1,221 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides compiled engagement regions of interest, which test whole arrays of
+positions against an ROI polygon at once.
+
+A CompiledROI precomputes the bounding box and the edges of the polygon of an `Engagement`.
+Positions outside the bounding box are rejected first, and the rest go through a vectorized
+even-odd (ray casting) test against every edge. Only x and y are tested, z is ignored.
+
+Optionally, the bounding box is also rasterized into a mask of cells which are fully inside,
+fully outside or crossed by an edge. Positions in the first two kinds of cells are resolved
+with a single lookup, and only positions in cells crossed by an edge go through the exact
+test, so the result is the same with or without the mask.
+
+`compile_rois` compiles every ROI of a `Configuration`, and caches the result by the content
+of its engagement section, so a configuration is only compiled again when it changes.
+
+Example usage:
+::
+
+    from rrmsutils.utils.roi import compile_rois
+
+    rois = compile_rois(configuration, mask_cell_size=4)
+
+    roi = rois.get(frame.cameraid)
+    if roi:
+        inside = roi.contains_points([detection.position for detection in frame.detections])
+
+    batch = FrameBatch.from_entries(entries)
+    inside = roi.contains(batch.all_detections.positions)
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+
+from rrmsutils.models.engagementanalytics.configuration import Configuration, Engagement
+from rrmsutils.models.point import Point3D
+from rrmsutils.utils.points import as_points
+
+_OUTSIDE = 0
+_INSIDE = 1
+_EDGE = 2
+
+_COMPILED = OrderedDict()
+_COMPILED_LOCK = threading.Lock()
+_COMPILED_SIZE = 16
+
+
+class CompiledROI:
+    """Region of interest polygon compiled for vectorized membership tests
+    """
+
+    def __init__(self, roi_id: str, vertices, mask_cell_size: float = None):
+        """
+        Initializes the ROI.
+
+        Args:
+            roi_id (str): The ROI identifier, the camera ID of the engagement.
+            vertices (np.ndarray): Array of shape (K, 2) or (K, 3) with the polygon vertices, in order.
+            mask_cell_size (float, optional): The side of the cells of the rasterized mask. Defaults to None
+                                              (no mask).
+        """
+        vertices = as_points(vertices)[:, :2]
+
+        self.id = roi_id
+        self.vertices = vertices
+        self.__valid = len(vertices) >= 3
+        if not self.__valid:
+            return
+
+        self.__x1, self.__y1 = vertices[:, 0], vertices[:, 1]
+        self.__x2, self.__y2 = np.roll(self.__x1, -1), np.roll(self.__y1, -1)
+        dy = self.__y2 - self.__y1
+        self.__slopes = np.divide(self.__x2 - self.__x1, dy, out=np.zeros_like(dy), where=dy != 0)
+        self.__min = vertices.min(axis=0)
+        self.__max = vertices.max(axis=0)
+
+        self.__mask = None
+        if mask_cell_size:
+            self.__cell_size = mask_cell_size
+            self.__mask = self.__rasterize(mask_cell_size)
+
+    @classmethod
+    def from_engagement(cls, engagement: Engagement, mask_cell_size: float = None) -> "CompiledROI":
+        """Compile the ROI of an engagement
+
+        Args:
+            engagement (Engagement): The engagement.
+            mask_cell_size (float, optional): The side of the cells of the rasterized mask. Defaults to None
+                                              (no mask).
+
+        Returns:
+            CompiledROI: The compiled ROI.
+        """
+        return cls(engagement.id, [(point.x, point.y) for point in engagement.roi], mask_cell_size)
+
+    def __crossings(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Exact even-odd test of the given coordinates"""
+        x = x[:, None]
+        y = y[:, None]
+        crosses = (self.__y1 > y) != (self.__y2 > y)
+        crosses &= x < self.__x1 + (y - self.__y1) * self.__slopes
+        return np.count_nonzero(crosses, axis=1) % 2 == 1
+
+    def __rasterize(self, cell_size: float) -> np.ndarray:
+        """Classifies the cells of the bounding box as inside, outside, or crossed by an edge"""
+        rows = max(1, math.ceil((self.__max[1] - self.__min[1]) / cell_size))
+        columns = max(1, math.ceil((self.__max[0] - self.__min[0]) / cell_size))
+        left = self.__min[0] + np.arange(columns) * cell_size
+        top = self.__min[1] + np.arange(rows) * cell_size
+
+        centers_x, centers_y = np.meshgrid(left + cell_size / 2, top + cell_size / 2)
+        mask = np.where(self.__crossings(centers_x.ravel(), centers_y.ravel()), _INSIDE, _OUTSIDE)
+        mask = mask.astype(np.uint8).reshape(rows, columns)
+
+        # A cell is crossed by an edge when the edge bounding box overlaps it and its corners are not all on one
+        # side of the edge line. The test is widened slightly so cells touched by an edge are resolved exactly.
+        margin = cell_size * 1e-6
+        x0, y0 = left[None, :] - margin, top[:, None] - margin
+        x1, y1 = x0 + cell_size + 2 * margin, y0 + cell_size + 2 * margin
+        for ax, ay, bx, by in zip(self.__x1, self.__y1, self.__x2, self.__y2):
+            overlaps = ((x0 <= max(ax, bx)) & (x1 >= min(ax, bx)) & (y0 <= max(ay, by)) & (y1 >= min(ay, by)))
+            sides = [(bx - ax) * (cy - ay) - (by - ay) * (cx - ax) for cx in (x0, x1) for cy in (y0, y1)]
+            above = sides[0] > 0
+            below = sides[0] < 0
+            for side in sides[1:]:
+                above &= side > 0
+                below &= side < 0
+            mask[overlaps & ~above & ~below] = _EDGE
+
+        return mask
+
+    def contains(self, positions) -> np.ndarray:
+        """Test which positions are inside the ROI
+
+        Args:
+            positions (np.ndarray): Array of shape (N, 2) or (N, 3) with the positions.
+
+        Returns:
+            np.ndarray: Boolean array of shape (N,), True for the positions inside the ROI.
+        """
+        positions = as_points(positions)
+        inside = np.zeros(len(positions), dtype=bool)
+        if not self.__valid or len(positions) == 0:
+            return inside
+
+        x = positions[:, 0]
+        y = positions[:, 1]
+        candidates = np.flatnonzero((x >= self.__min[0]) & (x <= self.__max[0]) &
+                                    (y >= self.__min[1]) & (y <= self.__max[1]))
+        if len(candidates) == 0:
+            return inside
+
+        x = x[candidates]
+        y = y[candidates]
+        if self.__mask is not None:
+            rows, columns = self.__mask.shape
+            row = np.minimum(((y - self.__min[1]) // self.__cell_size).astype(np.int64), rows - 1)
+            column = np.minimum(((x - self.__min[0]) // self.__cell_size).astype(np.int64), columns - 1)
+            state = self.__mask[row, column]
+            inside[candidates] = state == _INSIDE
+
+            edge = state == _EDGE
+            candidates = candidates[edge]
+            x = x[edge]
+            y = y[edge]
+
+        inside[candidates] = self.__crossings(x, y)
+        return inside
+
+    def contains_points(self, points: List[Point3D]) -> np.ndarray:
+        """Test which points are inside the ROI
+
+        Args:
+            points (List[Point3D]): The points.
+
+        Returns:
+            np.ndarray: Boolean array with one element per point, True for the points inside the ROI.
+        """
+        return self.contains(as_points([(point.x, point.y) for point in points], 2))
+
+
+def compile_rois(configuration: Configuration, mask_cell_size: float = None) -> Dict[str, CompiledROI]:
+    """Compile the ROIs of an engagement configuration, reusing the result while the configuration does not change
+
+    Args:
+        configuration (Configuration): The engagement configuration.
+        mask_cell_size (float, optional): The side of the cells of the rasterized masks. Defaults to None (no mask).
+
+    Returns:
+        Dict[str, CompiledROI]: The compiled ROI of every engagement, by ID. The dictionary is shared by every
+                                caller and must not be modified.
+    """
+    key = (configuration.model_dump_json(include={"engagement"}), mask_cell_size)
+    with _COMPILED_LOCK:
+        rois = _COMPILED.get(key)
+        if rois is not None:
+            _COMPILED.move_to_end(key)
+            return rois
+
+    rois = {engagement.id: CompiledROI.from_engagement(engagement, mask_cell_size)
+            for engagement in configuration.engagement}
+
+    with _COMPILED_LOCK:
+        _COMPILED[key] = rois
+        if len(_COMPILED) > _COMPILED_SIZE:
+            _COMPILED.popitem(last=False)
+    return rois
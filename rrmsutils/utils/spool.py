@@ -0,0 +1,221 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides an append-only on-disk spool for line protocol records.
+
+The WriteSpool stores batches of lines in numbered segment files inside a directory. Every
+batch is written as a record with its length and CRC32, so a record torn by a crash is
+detected and truncated when the spool is opened again. Segments are only deleted after they
+have been consumed, and the oldest segments are discarded when the spool exceeds its size cap.
+
+Record layout:
+::
+
+    <I payload length> <I payload crc32> <payload: utf-8 lines separated by newlines>
+
+Example usage:
+::
+
+    spool = WriteSpool("/var/spool/influx", max_bytes=256 * 1024 * 1024)
+    spool.append(["people,camera=cam0 count=3i 1735689600000000000"])
+
+    segment = spool.oldest_segment()
+    for lines in spool.read_segment(segment):
+        write(lines)
+    spool.remove_segment(segment)
+"""
+
+import logging
+import os
+import struct
+import threading
+import zlib
+
+_RECORD_HEADER = struct.Struct("<II")
+_SUFFIX = ".spool"
+
+
+def _segment_sequence(name: str) -> int:
+    """Gets the sequence number of a segment file name, or None if the name is not a segment written by the spool"""
+    if not name.endswith(_SUFFIX):
+        return None
+    try:
+        sequence = int(name[:-len(_SUFFIX)])
+    except ValueError:
+        return None
+    return sequence if sequence > 0 and name == f"{sequence:012d}{_SUFFIX}" else None
+
+
+class WriteSpool:
+    """Append-only, crash-safe, size-capped spool
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, segment_bytes: int = 16 * 1024 * 1024,
+                 fsync: bool = True, logger=None):
+        """
+        Opens the spool, recovering any segments left by a previous run.
+
+        Args:
+            directory (str): The directory holding the segment files. It is created if needed.
+            max_bytes (int, optional): The maximum total size of the spool. The oldest segments are discarded
+                                       beyond it. Defaults to 256 MiB.
+            segment_bytes (int, optional): The size at which a new segment is started. Defaults to 16 MiB.
+            fsync (bool, optional): Sync every appended record to disk. Defaults to True.
+            logger (logging.Logger, optional): The logger instance to log messages. Defaults to None.
+        """
+        self.__directory = directory
+        self.__max_bytes = max_bytes
+        self.__segment_bytes = segment_bytes
+        self.__fsync = fsync
+        self.logger = logger or logging.getLogger(__name__)
+        self.__lock = threading.Lock()
+        self.dropped_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.__segments = {}
+        for name in sorted(os.listdir(directory)):
+            sequence = _segment_sequence(name)
+            if sequence is None:
+                if name.endswith(_SUFFIX):
+                    self.logger.warning("Ignoring unexpected file %s in spool %s", name, directory)
+                continue
+
+            size = self.__recover(self.__path(sequence))
+            if size:
+                self.__segments[sequence] = size
+            else:
+                os.remove(self.__path(sequence))
+
+        self.__active = max(self.__segments, default=0) + 1
+        self.__segments[self.__active] = 0
+        self.__file = open(self.__path(self.__active), "ab")  # pylint: disable=consider-using-with
+
+    def __path(self, sequence: int) -> str:
+        return os.path.join(self.__directory, f"{sequence:012d}{_SUFFIX}")
+
+    def __recover(self, path: str) -> int:
+        """Truncates a segment after its last complete record and returns its valid size"""
+        valid = 0
+        with open(path, "rb") as segment:
+            data = segment.read()
+        while valid + _RECORD_HEADER.size <= len(data):
+            length, crc = _RECORD_HEADER.unpack_from(data, valid)
+            end = valid + _RECORD_HEADER.size + length
+            if end > len(data) or zlib.crc32(data[valid + _RECORD_HEADER.size:end]) != crc:
+                break
+            valid = end
+
+        if valid != len(data):
+            self.logger.warning("Truncating torn spool segment %s at %d bytes", path, valid)
+            with open(path, "r+b") as segment:
+                segment.truncate(valid)
+        return valid
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the spooled records"""
+        with self.__lock:
+            return sum(self.__segments.values())
+
+    @property
+    def pending(self) -> bool:
+        """Whether the spool holds records not consumed yet"""
+        return self.size > 0
+
+    def append(self, lines: list) -> bool:
+        """Append a batch of lines as a single record
+
+        Args:
+            lines (list): The line protocol strings.
+
+        Returns:
+            bool: True if the batch was stored, False otherwise.
+        """
+        payload = "\n".join(lines).encode()
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with self.__lock:
+            try:
+                if self.__segments[self.__active] + len(record) > self.__segment_bytes and self.__segments[self.__active]:
+                    self.__rotate()
+                self.__file.write(record)
+                self.__file.flush()
+                if self.__fsync:
+                    os.fsync(self.__file.fileno())
+                self.__segments[self.__active] += len(record)
+            except OSError as e:
+                self.logger.error("Error appending to spool: %s", e)
+                return False
+
+            self.__enforce_cap()
+        return True
+
+    def __rotate(self):
+        self.__file.close()
+        self.__active += 1
+        self.__segments[self.__active] = 0
+        self.__file = open(self.__path(self.__active), "ab")  # pylint: disable=consider-using-with
+
+    def __enforce_cap(self):
+        while sum(self.__segments.values()) > self.__max_bytes and len(self.__segments) > 1:
+            oldest = min(self.__segments)
+            self.dropped_bytes += self.__segments.pop(oldest)
+            os.remove(self.__path(oldest))
+            self.logger.warning("Spool size cap reached, discarded segment %d", oldest)
+
+    def oldest_segment(self) -> int:
+        """Get the oldest segment with records, closing the active segment if it is the only one
+
+        Returns:
+            int: The segment number, or None if the spool is empty.
+        """
+        with self.__lock:
+            sequences = [sequence for sequence, size in sorted(self.__segments.items()) if size > 0]
+            if not sequences:
+                return None
+            if sequences[0] == self.__active:
+                self.__rotate()
+            return sequences[0]
+
+    def read_segment(self, sequence: int):
+        """Read the batches stored in a closed segment
+
+        Args:
+            sequence (int): The segment number returned by `oldest_segment`.
+
+        Yields:
+            list: The lines of every batch, in append order.
+        """
+        with open(self.__path(sequence), "rb") as segment:
+            data = segment.read()
+
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, _ = _RECORD_HEADER.unpack_from(data, offset)
+            offset += _RECORD_HEADER.size
+            yield data[offset:offset + length].decode().split("\n")
+            offset += length
+
+    def remove_segment(self, sequence: int):
+        """Delete a consumed segment
+
+        Args:
+            sequence (int): The segment number returned by `oldest_segment`.
+        """
+        with self.__lock:
+            if self.__segments.pop(sequence, None) is not None:
+                os.remove(self.__path(sequence))
+
+    def close(self):
+        """Close the active segment
+        """
+        with self.__lock:
+            self.__file.close()
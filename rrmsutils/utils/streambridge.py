@@ -0,0 +1,217 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a bridge that continuously moves `Frame` and `Heatmap` payloads from
+Redis streams into InfluxDB.
+
+The StreamBridge reads the streams as a Redis consumer group in large batches, maps every
+payload to line protocol through a pluggable mapper, writes the whole batch to InfluxDB in a
+single request and only then acknowledges the entries. Entries delivered but not acknowledged
+before a crash are read again on the next start, so no data is lost.
+
+A mapper is any callable taking the decoded model, the stream name and the entry ID, and
+returning a list of line protocol strings. `FrameMapper` and `HeatmapMapper` are provided.
+
+Heatmap streams written by a `HeatmapSchemaGenerator` in delta mode are supported: delta
+entries are applied in order and the mapper receives the full rebuilt heatmap. Deltas read
+before the first keyframe, or after a missed entry, cannot be rebuilt and are skipped until
+the next keyframe.
+
+Example usage:
+::
+
+    redis_client = RedisClient(decode_responses=False)
+    influx_client = InfluxDB(url=my_url, org=my_org, bucket=my_bucket)
+
+    bridge = StreamBridge(redis_client, influx_client, {
+        "detection": (Frame, FrameMapper()),
+        "heatmap": (Heatmap, HeatmapMapper()),
+    })
+    bridge.run(stop_event)
+"""
+
+import logging
+import threading
+
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.models.heatmap import Heatmap, HeatmapDelta
+from rrmsutils.utils.influxdb import InfluxDB
+from rrmsutils.utils.lineprotocol import LineProtocolEncoder
+from rrmsutils.utils.payload import HeatmapDeltaDecoder, decode_payload, is_heatmap_delta
+from rrmsutils.utils.redisclient import RedisClient
+
+
+def entry_time_ns(entry_id) -> int:
+    """Get the time of a stream entry from its ID
+
+    The sequence number of the ID is added as nanoseconds, so entries added in the same
+    millisecond keep distinct times.
+
+    Args:
+        entry_id (str | bytes): The stream entry ID.
+
+    Returns:
+        int: The entry time in nanoseconds since the epoch.
+    """
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    milliseconds, sequence = entry_id.split("-")
+    return int(milliseconds) * 1000000 + int(sequence)
+
+
+class FrameMapper:
+    """Maps every detection of a `Frame` to a point with its object ID, position and direction
+
+    Points are tagged with the camera ID and the detection index within the frame. The object ID is
+    a field, since object IDs never stop growing and would make the number of series unbounded.
+    """
+
+    def __init__(self, measurement: str = "detection"):
+        """
+        Initializes the mapper.
+
+        Args:
+            measurement (str, optional): The measurement name. Defaults to "detection".
+        """
+        self.__encoder = LineProtocolEncoder(measurement)
+
+    def __call__(self, frame: Frame, stream: str, entry_id) -> list:
+        timestamp = entry_time_ns(entry_id)
+        return self.__encoder.encode_many(
+            ({"cameraid": frame.cameraid, "detection": str(index)},
+             {"objectid": detection.objectid,
+              "x": detection.position.x, "y": detection.position.y, "z": detection.position.z,
+              "dx": detection.direction.x, "dy": detection.direction.y, "dz": detection.direction.z},
+             timestamp)
+            for index, detection in enumerate(frame.detections))
+
+
+class HeatmapMapper:
+    """Maps every blob of a `Heatmap` to a point tagged with the stream name and blob index
+    """
+
+    def __init__(self, measurement: str = "heatmap"):
+        """
+        Initializes the mapper.
+
+        Args:
+            measurement (str, optional): The measurement name. Defaults to "heatmap".
+        """
+        self.__encoder = LineProtocolEncoder(measurement)
+
+    def __call__(self, heatmap: Heatmap, stream: str, entry_id) -> list:
+        timestamp = entry_time_ns(entry_id)
+        return self.__encoder.encode_many(
+            ({"stream": stream, "blob": str(index)},
+             {"x": blob.position.x, "y": blob.position.y, "intensity": blob.intensity, "radius": blob.radius},
+             timestamp)
+            for index, blob in enumerate(heatmap.heatmap))
+
+
+class StreamBridge:
+    """Redis stream to InfluxDB bridge
+    """
+
+    def __init__(self, redis_client: RedisClient, influx: InfluxDB, streams: dict, group: str = "influxdb-bridge",
+                 consumer: str = "bridge", batch_size: int = 1000, block: int = 1000, logger=None):
+        """
+        Initializes the bridge and creates the consumer group on every stream.
+
+        Args:
+            redis_client (RedisClient): The client used to read the streams. Create it with
+                                        decode_responses=False to support binary payloads.
+            influx (InfluxDB): The client used to write the points.
+            streams (dict): A dictionary mapping each stream name to a (model_type, mapper) tuple.
+            group (str, optional): The consumer group name. Defaults to "influxdb-bridge".
+            consumer (str, optional): The consumer name within the group. Defaults to "bridge".
+            batch_size (int, optional): The maximum number of entries read per stream and batch. Defaults to 1000.
+            block (int, optional): The maximum time in milliseconds to wait for new entries. Defaults to 1000.
+            logger (logging.Logger, optional): The logger instance to log messages. Defaults to None.
+        """
+        self.__redis = redis_client
+        self.__influx = influx
+        self.__streams = streams
+        self.__group = group
+        self.__consumer = consumer
+        self.__batch_size = batch_size
+        self.__block = block
+        self.__recovering = True
+        self.__decoders = {stream: HeatmapDeltaDecoder() for stream in streams}
+        self.logger = logger or logging.getLogger(__name__)
+
+        for stream in streams:
+            self.__redis.create_group(stream, group)
+
+    def run_once(self) -> int:
+        """Move one batch of entries from the streams to InfluxDB
+
+        Entries left unacknowledged by a previous run, or by a failed write, are processed first.
+
+        Returns:
+            int: The number of entries acknowledged, or -1 if the write failed and the batch will be retried.
+        """
+        entries = self.__redis.read_group(list(self.__streams), self.__group, self.__consumer,
+                                          count=self.__batch_size, block=self.__block, pending=self.__recovering)
+        if self.__recovering and not any(messages for _, messages in entries):
+            self.__recovering = False
+            return 0
+
+        # The batch is read again if the write fails, so its deltas must be applied again
+        decoders = {stream: decoder.copy() for stream, decoder in self.__decoders.items()}
+
+        lines = []
+        processed = {}
+        for stream, messages in entries:
+            if isinstance(stream, bytes):
+                stream = stream.decode()
+            model_type, mapper = self.__streams[stream]
+            for entry_id, fields in messages:
+                processed.setdefault(stream, []).append(entry_id)
+                try:
+                    model = self.__decode(stream, fields, model_type)
+                    if model is None:
+                        self.logger.warning("Skipping delta entry %s from stream %s until the next keyframe",
+                                            entry_id, stream)
+                        continue
+                    lines.extend(mapper(model, stream, entry_id))
+                except Exception as e:
+                    # Undecodable entries are acknowledged so they do not block the stream
+                    self.logger.error("Error mapping entry %s from stream %s: %s", entry_id, stream, e)
+
+        if lines and not self.__influx.write_lines(lines, sync=True):
+            # The entries stay in the pending list of the group, read them from there on the next call
+            self.__decoders = decoders
+            self.__recovering = True
+            return -1
+
+        count = 0
+        for stream, ids in processed.items():
+            if self.__redis.ack(stream, self.__group, ids):
+                count += len(ids)
+        return count
+
+    def __decode(self, stream: str, fields: dict, model_type):
+        """Decodes an entry, rebuilding the heatmap of delta entries, or returns None if it cannot be rebuilt"""
+        if model_type is Heatmap and is_heatmap_delta(fields):
+            return self.__decoders[stream].apply(decode_payload(fields, HeatmapDelta))
+        return decode_payload(fields, model_type)
+
+    def run(self, stop_event: threading.Event = None):
+        """Move entries until the stop event is set
+
+        Args:
+            stop_event (threading.Event, optional): Stops the bridge when set. Defaults to None (run forever).
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            if self.run_once() < 0:
+                # Give the server time to recover before retrying the batch
+                stop_event.wait(self.__block / 1000)
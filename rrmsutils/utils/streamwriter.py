@@ -0,0 +1,102 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a buffered, non-blocking producer for Redis streams.
+
+The BufferedStreamWriter queues stream entries in a bounded in-memory `BatchQueue` and a
+background thread writes them to Redis in pipelined batches, so the caller never waits on the
+network. When the buffer is full the writer either drops the oldest queued entry or blocks the
+caller, depending on the configured policy. Batches that Redis rejects are put back at the front of
+the buffer and retried, up to a maximum number of retries, before they are dropped. Pending
+entries are flushed on `close`.
+
+Example usage:
+::
+
+    redis_client = RedisClient()
+    writer = BufferedStreamWriter(redis_client, max_size=10000, batch_size=100)
+    writer.write_to_stream("detection", {"data": "..."})
+    writer.close()
+"""
+
+from rrmsutils.utils.batchqueue import BLOCK, DROP_OLDEST, BatchQueue
+from rrmsutils.utils.redisclient import RedisClient
+
+__all__ = ["BLOCK", "DROP_OLDEST", "BufferedStreamWriter"]
+
+
+class BufferedStreamWriter:
+    """Buffered Redis stream producer
+    """
+
+    def __init__(self, redis_client: RedisClient, max_size: int = 10000, batch_size: int = 100,
+                 flush_interval: float = 0.05, policy: str = DROP_OLDEST, max_retries: int = 3,
+                 retry_interval: float = 0.1, logger=None):
+        """
+        Initializes the writer and starts the background flusher thread.
+
+        Args:
+            redis_client (RedisClient): The client used to write to Redis.
+            max_size (int, optional): The maximum number of entries kept in the buffer. Defaults to 10000.
+            batch_size (int, optional): The maximum number of entries written per pipeline. Defaults to 100.
+            flush_interval (float, optional): The maximum time in seconds an entry waits in the buffer before
+                                              being written. Defaults to 0.05.
+            policy (str, optional): What to do when the buffer is full, either "drop_oldest" or "block".
+                                    Defaults to "drop_oldest".
+            max_retries (int, optional): The number of times a batch rejected by Redis is retried before it is
+                                         dropped. Defaults to 3.
+            retry_interval (float, optional): The delay in seconds before the first retry. It doubles on every
+                                              retry. Defaults to 0.1.
+            logger (logging.Logger, optional): The logger instance to log messages. Defaults to None.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        self.__queue = BatchQueue(redis_client.write_many_to_stream, max_size=max_size, batch_size=batch_size,
+                                  flush_interval=flush_interval, policy=policy, max_retries=max_retries,
+                                  retry_interval=retry_interval, name="BufferedStreamWriter", logger=logger)
+
+    @property
+    def dropped(self) -> int:
+        """Number of entries discarded because the buffer was full or Redis rejected them"""
+        return self.__queue.dropped
+
+    def write_to_stream(self, stream: str, data: dict, maxlen: int = 1000, retention: float = None) -> bool:
+        """Queue data to be written to a Redis stream
+
+        Args:
+            stream (str): The name of the stream
+            data (dict): The data to write to the stream
+            maxlen (int): The maximum number of entries to keep in the stream. The trimming is approximate.
+            retention (float, optional): When set, trim entries older than this number of seconds instead of
+                                         using maxlen. Defaults to None.
+        Returns:
+            bool: True if the data was queued, False if the writer is closed.
+        """
+        return self.__queue.put([(stream, data, maxlen, retention)])
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued entry has been written
+
+        Args:
+            timeout (float, optional): The maximum time to wait in seconds. Defaults to None (wait forever).
+        Returns:
+            bool: True if the buffer was drained, False if the timeout expired.
+        """
+        return self.__queue.flush(timeout)
+
+    def close(self, timeout: float = None):
+        """Flush pending entries and stop the background thread
+
+        Args:
+            timeout (float, optional): The maximum time to wait for the flush in seconds. Defaults to None.
+        """
+        self.__queue.close(timeout)
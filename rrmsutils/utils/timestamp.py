@@ -0,0 +1,62 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides a timestamp formatter that formats the date and time only once per second.
+
+Producers stamp every frame with the current time, and `time.strftime` dominates the cost of
+building small payloads. The SecondFormatter caches the formatted date and time of the current
+second, so callers only append the sub-second part.
+
+Example usage:
+::
+
+    from rrmsutils.utils.timestamp import SecondFormatter
+
+    formatter = SecondFormatter("%Y-%m-%dT%H:%M:%S", utc=True)
+
+    second, micro = divmod(time.time_ns() // 1000, 1000000)
+    timestamp = f"{formatter.format(second)}.{micro:06d}Z"
+"""
+
+import time
+
+
+class SecondFormatter:
+    """Date and time formatter caching the last formatted second
+    """
+
+    def __init__(self, date_format: str, utc: bool = False):
+        """
+        Initializes the formatter.
+
+        Args:
+            date_format (str): The `time.strftime` format of the date and time.
+            utc (bool, optional): Format the UTC time instead of the local time. Defaults to False.
+        """
+        self.__date_format = date_format
+        self.__convert = time.gmtime if utc else time.localtime
+        self.__last = (None, "")
+
+    def format(self, second: int) -> str:
+        """Format a time with second precision
+
+        Args:
+            second (int): The time in whole seconds since the epoch.
+
+        Returns:
+            str: The formatted date and time.
+        """
+        # The second and its text are swapped together, so concurrent callers never mix them up
+        last_second, text = self.__last
+        if second != last_second:
+            text = time.strftime(self.__date_format, self.__convert(second))
+            self.__last = (second, text)
+        return text
@@ -0,0 +1,333 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""
+This module provides the transports used by the schema generators to move stream entries
+from a producer to its consumers.
+
+Classes:
+    Transport: Base class for every transport.
+    RedisTransport: Redis stream transport, the default.
+    QueueTransport: In-process queue for producers and consumers living in the same process.
+        Models are handed over as objects, skipping serialization entirely.
+    SharedMemoryTransport: Ring buffer in `multiprocessing.shared_memory` for producers and
+        consumers running on the same host.
+
+Example usage:
+::
+
+    from rrmsutils.directionschemagenerator import DirectionSchemaGenerator
+    from rrmsutils.utils.transport import SharedMemoryTransport
+
+    # Producer process
+    producer = DirectionSchemaGenerator("detection", transport=SharedMemoryTransport("detection", create=True))
+    producer.send(detections)
+
+    # Consumer process
+    consumer = DirectionSchemaGenerator("detection", transport=SharedMemoryTransport("detection"))
+    frame, last_id = consumer.get()
+"""
+
+import queue
+import struct
+import time
+from abc import ABC, abstractmethod
+from multiprocessing import resource_tracker, shared_memory
+from typing import Tuple
+
+from rrmsutils.utils.redisclient import RedisClient
+from rrmsutils.utils.streamwriter import DROP_OLDEST, BufferedStreamWriter
+
+
+class Transport(ABC):
+    """Base class for the schema generator transports. Subclasses must implement `write` and `read`.
+
+    Attributes:
+        serialize (bool): Whether entries must be encoded before being written. Transports that
+                          keep entries inside the process set it to False and receive the model
+                          under the "model" field instead.
+    """
+
+    serialize = True
+
+    @abstractmethod
+    def write(self, fields: dict, maxlen: int = 1000, retention: float = None) -> bool:
+        """Write an entry
+
+        Args:
+            fields (dict): The entry fields.
+            maxlen (int, optional): The maximum number of entries to keep, if supported. Defaults to 1000.
+            retention (float, optional): The time in seconds to keep entries, if supported. Defaults to None.
+
+        Returns:
+            bool: True if the entry was written successfully, False otherwise.
+        """
+
+    @abstractmethod
+    def read(self, block: int = 5000, last_id: str = '$') -> Tuple[dict, str]:
+        """Read the entry following last_id
+
+        Args:
+            block (int, optional): The maximum time in milliseconds to wait for an entry, 0 waits forever.
+                                   Defaults to 5000.
+            last_id (str, optional): The ID of the last entry read. '$' waits for new entries. Defaults to '$'.
+
+        Returns:
+            Tuple[dict, str]: The entry fields, or None on timeout, and the ID of the last entry read.
+        """
+
+    def close(self):
+        """Release the transport resources
+        """
+
+
+class RedisTransport(Transport):
+    """Redis stream transport
+    """
+
+    def __init__(self, redis_stream: str, redis_port: int = 6379, redis_host: str = "localhost",
+                 buffer_size: int = 0, buffer_policy: str = DROP_OLDEST):
+        """
+        Initializes the transport.
+
+        Args:
+            redis_stream (str): The name of the Redis stream.
+            redis_port (int, optional): The port number of the Redis server. Defaults to 6379.
+            redis_host (str, optional): The hostname of the Redis server. Defaults to "localhost".
+            buffer_size (int, optional): When greater than zero, writes are queued and sent by a background
+                                         `BufferedStreamWriter`. Defaults to 0 (unbuffered).
+            buffer_policy (str, optional): What to do when the buffer is full, either "drop_oldest" or "block".
+                                           Defaults to "drop_oldest".
+        """
+        self.__redis_stream = redis_stream
+        self.__redis = RedisClient(redis_host, redis_port, decode_responses=False)
+        self.__writer = self.__redis
+        if buffer_size > 0:
+            self.__writer = BufferedStreamWriter(self.__redis, max_size=buffer_size, policy=buffer_policy)
+
+    def write(self, fields: dict, maxlen: int = 1000, retention: float = None) -> bool:
+        return self.__writer.write_to_stream(self.__redis_stream, fields, maxlen=maxlen, retention=retention)
+
+    def read(self, block: int = 5000, last_id: str = '$') -> Tuple[dict, str]:
+        entries, last_id = self.__redis.read_from_stream(
+            stream=self.__redis_stream, count=1, block=block, last_id=last_id)
+
+        if isinstance(last_id, bytes):
+            last_id = last_id.decode()
+
+        if not entries or len(entries) == 0:
+            return None, last_id
+
+        _, fields = entries[0][1][0]
+        return fields, last_id
+
+    def close(self):
+        if isinstance(self.__writer, BufferedStreamWriter):
+            self.__writer.close()
+
+
+class QueueTransport(Transport):
+    """In-process queue transport
+
+    Every entry is delivered to a single consumer and last_id is ignored. Models are passed by
+    reference, so they must not be modified after being sent.
+    """
+
+    serialize = False
+
+    def __init__(self, max_size: int = 0):
+        """
+        Initializes the transport.
+
+        Args:
+            max_size (int, optional): The maximum number of queued entries. When full, the oldest entry
+                                      is dropped. Defaults to 0 (unbounded).
+        """
+        self.__queue = queue.Queue(max_size)
+        self.__count = 0
+
+    def write(self, fields: dict, maxlen: int = 1000, retention: float = None) -> bool:
+        while True:
+            try:
+                self.__queue.put_nowait(fields)
+                return True
+            except queue.Full:
+                try:
+                    self.__queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def read(self, block: int = 5000, last_id: str = '$') -> Tuple[dict, str]:
+        try:
+            fields = self.__queue.get(timeout=block / 1000 if block else None)
+        except queue.Empty:
+            return None, last_id
+
+        self.__count += 1
+        return fields, str(self.__count)
+
+
+_HEADER = struct.Struct("<IIIxxxxQ")
+_SLOT_HEADER = struct.Struct("<QIxxxx")
+_MAGIC = 0x52524d53
+_FIELD_COUNT = struct.Struct("<H")
+_FIELD_NAME = struct.Struct("<H")
+_FIELD_VALUE = struct.Struct("<I")
+
+
+def _pack_fields(fields: dict) -> bytes:
+    parts = [_FIELD_COUNT.pack(len(fields))]
+    for name, value in fields.items():
+        name = name.encode() if isinstance(name, str) else name
+        value = value.encode() if isinstance(value, str) else bytes(value)
+        parts.extend((_FIELD_NAME.pack(len(name)), name, _FIELD_VALUE.pack(len(value)), value))
+    return b"".join(parts)
+
+
+def _unpack_fields(buffer: bytes) -> dict:
+    (count,) = _FIELD_COUNT.unpack_from(buffer, 0)
+    offset = _FIELD_COUNT.size
+    fields = {}
+    for _ in range(count):
+        (length,) = _FIELD_NAME.unpack_from(buffer, offset)
+        offset += _FIELD_NAME.size
+        name = buffer[offset:offset + length]
+        offset += length
+        (length,) = _FIELD_VALUE.unpack_from(buffer, offset)
+        offset += _FIELD_VALUE.size
+        fields[name] = buffer[offset:offset + length]
+        offset += length
+    return fields
+
+
+class SharedMemoryTransport(Transport):
+    """Shared memory ring buffer transport
+
+    Entries are stored in a fixed number of fixed size slots. A single producer process
+    creates the buffer and any number of consumer processes attach to it by name. Each
+    consumer keeps its own position; consumers that fall behind by more than the number
+    of slots skip to the oldest entry still available. Fields are returned as bytes, as
+    a Redis connection without response decoding would.
+
+    The creator owns the block and unlinks it on `close`. Consumers detach from Python's
+    resource tracker so they never destroy the block when they exit; on Python < 3.13 a
+    consumer forked from the creator shares its tracker and may log a harmless KeyError
+    when the creator unlinks the block.
+    """
+
+    def __init__(self, name: str, slots: int = 256, slot_size: int = 65536, create: bool = False,
+                 poll_interval: float = 0.001):
+        """
+        Initializes the transport.
+
+        Args:
+            name (str): The name of the shared memory block.
+            slots (int, optional): The number of entries kept in the ring buffer. Only used by the creator.
+                                   Defaults to 256.
+            slot_size (int, optional): The maximum size in bytes of an encoded entry. Only used by the creator.
+                                       Defaults to 65536.
+            create (bool, optional): Create the shared memory block. The producer should create it and
+                                     consumers attach to it. Defaults to False.
+            poll_interval (float, optional): Time in seconds between checks for new entries while blocking.
+                                             Defaults to 0.001.
+
+        Raises:
+            ValueError: If the shared memory block is not a ring buffer.
+        """
+        self.__create = create
+        self.__poll_interval = poll_interval
+
+        if create:
+            self.__shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_HEADER.size + slots * (_SLOT_HEADER.size + slot_size))
+            _HEADER.pack_into(self.__shm.buf, 0, _MAGIC, slots, slot_size, 0)
+        else:
+            self.__shm = _attach(name)
+
+        magic, self.__slots, self.__slot_size, _ = _HEADER.unpack_from(self.__shm.buf, 0)
+        if magic != _MAGIC:
+            self.__shm.close()
+            raise ValueError(f"Shared memory {name} is not a ring buffer")
+
+    def __head(self) -> int:
+        return _HEADER.unpack_from(self.__shm.buf, 0)[3]
+
+    def __slot_offset(self, seq: int) -> int:
+        return _HEADER.size + ((seq - 1) % self.__slots) * (_SLOT_HEADER.size + self.__slot_size)
+
+    def write(self, fields: dict, maxlen: int = 1000, retention: float = None) -> bool:
+        payload = _pack_fields(fields)
+        if len(payload) > self.__slot_size:
+            return False
+
+        buf = self.__shm.buf
+        seq = self.__head() + 1
+        offset = self.__slot_offset(seq)
+
+        # Invalidate the slot while it is rewritten so readers detect torn entries
+        _SLOT_HEADER.pack_into(buf, offset, 0, 0)
+        start = offset + _SLOT_HEADER.size
+        buf[start:start + len(payload)] = payload
+        _SLOT_HEADER.pack_into(buf, offset, seq, len(payload))
+        struct.pack_into("<Q", buf, _HEADER.size - 8, seq)
+        return True
+
+    def __read_slot(self, seq: int):
+        buf = self.__shm.buf
+        offset = self.__slot_offset(seq)
+        slot_seq, length = _SLOT_HEADER.unpack_from(buf, offset)
+        if slot_seq != seq:
+            return None
+
+        start = offset + _SLOT_HEADER.size
+        payload = bytes(buf[start:start + length])
+        if _SLOT_HEADER.unpack_from(buf, offset)[0] != seq:
+            return None
+
+        return _unpack_fields(payload)
+
+    def read(self, block: int = 5000, last_id: str = '$') -> Tuple[dict, str]:
+        head = self.__head()
+        if last_id == '$':
+            last = head
+        else:
+            last = int(str(last_id).split("-", maxsplit=1)[0])
+
+        deadline = time.monotonic() + block / 1000 if block else None
+        while True:
+            head = self.__head()
+            if head > last:
+                seq = max(last + 1, head - self.__slots + 1)
+                fields = self.__read_slot(seq)
+                if fields is not None:
+                    return fields, str(seq)
+                # Overwritten while reading, the producer lapped this consumer
+                last = seq
+                continue
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return None, str(last)
+            time.sleep(self.__poll_interval)
+
+    def close(self):
+        self.__shm.close()
+        if self.__create:
+            self.__shm.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attaches to an existing shared memory block without letting this process destroy it at exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers attached blocks with the resource tracker as well
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")  # pylint: disable=protected-access
+        return shm
@@ -37,6 +37,11 @@ setuptools.setup(
         'pydantic',
         'redis',
         'influxdb',
-        'influxdb-client'
+        'influxdb-client',
+        'numpy'
     ],
+    extras_require={
+        'zstd': ['zstandard'],
+        'lz4': ['lz4'],
+    },
 )
@@ -0,0 +1,55 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the bounded batch writer queue."""
+
+from rrmsutils.utils.batchqueue import BatchQueue
+
+
+class FlakyWriter:
+    """Raises on the given number of writes first, recording the written items"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.items = []
+
+    def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("server unreachable")
+        self.items.extend(batch)
+        return True
+
+
+def test_raising_write_is_retried():
+    writer = FlakyWriter(failures=2)
+    queue = BatchQueue(writer, batch_size=10, flush_interval=0.01, retry_interval=0.01)
+
+    assert queue.put([1, 2, 3])
+    assert queue.flush(timeout=5)
+    assert writer.items == [1, 2, 3]
+
+    # The writer thread survived and keeps writing
+    assert queue.put([4])
+    assert queue.flush(timeout=5)
+    assert writer.items == [1, 2, 3, 4]
+    queue.close()
+
+
+def test_raising_write_goes_to_on_failure():
+    failed = []
+    queue = BatchQueue(FlakyWriter(failures=100), batch_size=10, flush_interval=0.01, max_retries=1,
+                       retry_interval=0.01, on_failure=lambda batch: failed.append(batch) is None)
+
+    assert queue.put([1, 2])
+    assert queue.flush(timeout=5)
+    assert failed == [[1, 2]]
+    assert queue.dropped == 0
+    queue.close()
@@ -0,0 +1,60 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the direction schema generator, run against fakeredis and an in-process queue."""
+
+import pytest
+
+from rrmsutils.directionschemagenerator import DirectionSchemaGenerator
+from rrmsutils.utils import redisclient
+from rrmsutils.utils.payload import BINARY
+from rrmsutils.utils.transport import QueueTransport
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(name="fake_redis")
+def fixture_fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    def fake_redis(*args, **kwargs):
+        kwargs.pop("host", None)
+        kwargs.pop("port", None)
+        return fakeredis.FakeRedis(*args, server=server, **kwargs)
+
+    monkeypatch.setattr(redisclient, "Redis", fake_redis)
+
+
+@pytest.mark.parametrize("encoding", ["json", BINARY])
+def test_send_raw_empty_frame(fake_redis, encoding):
+    generator = DirectionSchemaGenerator("detection", camera_id="cam0", encoding=encoding)
+    assert generator.send_raw([], [], [])
+
+    frame, _ = generator.get(block=1, last_id="0")
+    assert frame.cameraid == "cam0"
+    assert not frame.detections
+
+
+def test_send_raw_empty_frame_in_process():
+    generator = DirectionSchemaGenerator("detection", camera_id="cam0", transport=QueueTransport())
+    assert generator.send_raw([], [], [])
+
+    frame, _ = generator.get(block=1)
+    assert not frame.detections
+
+
+def test_send_raw_two_dimensional_positions(fake_redis):
+    generator = DirectionSchemaGenerator("detection", camera_id="cam0")
+    assert generator.send_raw(["a", "b", "c"], [(1, 2), (3, 4), (5, 6)], [(1, 0), (0, 1), (1, 1)])
+    assert not generator.send_raw(["a", "b"], [(1, 2)], [(1, 0)])
+
+    frame, _ = generator.get(block=1, last_id="0")
+    assert [(d.objectid, d.position.x, d.position.y, d.position.z) for d in frame.detections] == [
+        ("a", 1, 2, 0), ("b", 3, 4, 0), ("c", 5, 6, 0)]
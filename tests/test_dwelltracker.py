@@ -0,0 +1,62 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the dwell-time tracker, run against fakeredis."""
+
+import pytest
+
+from rrmsutils.utils import redisclient
+from rrmsutils.utils.dwelltracker import DwellTracker
+from rrmsutils.utils.redisclient import RedisClient
+
+fakeredis = pytest.importorskip("fakeredis")
+
+DAY = 86400
+
+
+@pytest.fixture(name="redis_client")
+def fixture_redis_client(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    def fake_redis(*args, **kwargs):
+        kwargs.pop("host", None)
+        kwargs.pop("port", None)
+        return fakeredis.FakeRedis(*args, server=server, **kwargs)
+
+    monkeypatch.setattr(redisclient, "Redis", fake_redis)
+    return RedisClient()
+
+
+def test_object_dwell_times_expire_apart_from_the_totals(redis_client):
+    tracker = DwellTracker(redis_client, message_expiration=5, db_update_period=5)
+    start = 10 * DAY + 100
+
+    tracker.update("door", ["a", "b"], [True, True], start)
+    tracker.update("door", ["a", "b"], [True, False], start + 2)
+    assert tracker.flush(start + 3)
+
+    tracker.update("door", ["a"], [True], DAY + start)
+    tracker.update("door", ["a"], [True], DAY + start + 1)
+    assert tracker.flush(DAY + start + 2)
+
+    redis = redis_client._redis  # pylint: disable=protected-access
+    assert redis.hgetall("engagement:door") == {"dwell": "3", "visits": "3"}
+    assert redis.ttl("engagement:door") == -1
+
+    assert redis.hgetall(f"engagement:door:objects:{10 * DAY}") == {"a": "2"}
+    assert redis.hgetall(f"engagement:door:objects:{11 * DAY}") == {"a": "1"}
+    # Kept until the end of the next period
+    assert redis.ttl(f"engagement:door:objects:{11 * DAY}") == 2 * DAY - 102
+
+
+def test_reserved_object_ids_are_rejected(redis_client):
+    tracker = DwellTracker(redis_client)
+    with pytest.raises(ValueError):
+        tracker.update("door", ["a", "visits"], [True, True], 0)
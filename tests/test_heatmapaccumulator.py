@@ -0,0 +1,26 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the time-decayed heatmap accumulator."""
+
+import pytest
+
+from rrmsutils.utils.heatmapaccumulator import HeatmapAccumulator
+
+
+@pytest.mark.parametrize("gap", [45 * 60, 17 * 3600 + 10 * 60, 365 * 24 * 3600])
+def test_detections_after_a_long_gap(gap):
+    accumulator = HeatmapAccumulator(100, 100, cell_size=10, half_life=60)
+    accumulator.add([(5, 5)], timestamp=0)
+    accumulator.add([(55, 55)], timestamp=gap)
+
+    grid = accumulator.grid(now=gap)
+    assert grid[5, 5] == pytest.approx(1.0)
+    assert grid[0, 0] == pytest.approx(0.5 ** (gap / 60), abs=1e-300)
@@ -0,0 +1,45 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the InfluxDB utility, run against a fake write API."""
+
+import pytest
+
+from rrmsutils.utils.influxdb import InfluxDB
+
+
+class FakeWriteApi:
+    """Keeps the last point of every series and time, like InfluxDB does"""
+
+    def __init__(self):
+        self.points = {}
+
+    def write(self, bucket, org, record):
+        for point in record:
+            line = point if isinstance(point, str) else point.to_line_protocol()
+            series, fields, timestamp = line.rsplit(" ", 2)
+            self.points[(series, timestamp)] = fields
+
+
+@pytest.fixture(name="influx")
+def fixture_influx(monkeypatch):
+    monkeypatch.setenv("INFLUXDB_TOKEN", "token")
+    client = InfluxDB(url="http://localhost:8086", org="org", bucket="bucket", batch_size=10, flush_interval=60)
+    client.write_api = FakeWriteApi()
+    yield client
+    client.close()
+
+
+def test_batched_points_of_the_same_series_survive(influx):
+    assert influx.write_data("frames", {"camera": "cam0"}, {"objects": 3})
+    assert influx.write_data("frames", {"camera": "cam0"}, {"objects": 4})
+    assert influx.flush(timeout=5)
+
+    assert sorted(influx.write_api.points.values()) == ["objects=3i", "objects=4i"]
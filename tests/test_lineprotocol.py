@@ -0,0 +1,26 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the line protocol encoder."""
+
+import numpy as np
+
+from rrmsutils.utils.lineprotocol import LineProtocolEncoder
+
+
+def test_numpy_scalars_keep_their_field_types():
+    encoder = LineProtocolEncoder("frames")
+    fields = {"n": np.int64(3), "f": np.float32(0.5), "b": np.bool_(True)}
+
+    line = encoder.encode({"camera": "cam0"}, fields, 1)
+    columns = encoder.encode_columns({"camera": "cam0"}, {name: [value] for name, value in fields.items()}, [1])
+
+    assert line == "frames,camera=cam0 n=3i,f=0.5,b=true 1"
+    assert columns == [line]
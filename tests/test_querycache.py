@@ -0,0 +1,95 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the windowed InfluxDB query cache, run against a fake client."""
+
+import threading
+from datetime import datetime
+
+from rrmsutils.utils.querycache import QueryCache
+
+
+class FakeRecord:
+    def __init__(self, timestamp, value):
+        self.timestamp = timestamp
+        self.value = value
+
+    def get_time(self):
+        return datetime.fromtimestamp(self.timestamp).astimezone()
+
+
+class FakeTable:
+    def __init__(self, records):
+        self.records = records
+
+
+class FakeInflux:
+    """Sums the points of every one second window, stamping it with the window end"""
+
+    def __init__(self):
+        self.points = {}
+        self.queries = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def query_data(self, query):
+        self.queries += 1
+        self.started.set()
+        self.release.wait(5)
+        start, stop = (datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").timestamp() for value in query.split("|"))
+        ends = sorted({int(timestamp) + 1 for timestamp in self.points if start <= timestamp < stop})
+        return [FakeTable([FakeRecord(end, sum(value for timestamp, value in self.points.items()
+                                               if end - 1 <= timestamp < end)) for end in ends])]
+
+
+TEMPLATE = "{start}|{stop}"
+
+
+def values(records):
+    return [(record.timestamp, record.value) for record in records]
+
+
+def test_late_points_within_grace_are_seen():
+    influx = FakeInflux()
+    now = [1000.0]
+    cache = QueryCache(influx, grace=5, clock=lambda: now[0])
+
+    influx.points[990.5] = 1
+    assert values(cache.query(TEMPLATE, start=980, every=1)) == [(991, 1)]
+
+    # A point arriving late in a window that ended less than grace seconds ago
+    influx.points[997.5] = 2
+    now[0] = 1001.0
+    assert values(cache.query(TEMPLATE, start=980, every=1)) == [(991, 1), (998, 2)]
+
+    # Windows older than grace are served from the cache
+    influx.points[990.6] = 4
+    assert values(cache.query(TEMPLATE, start=980, every=1)) == [(991, 1), (998, 2)]
+
+
+def test_slow_query_does_not_block_other_callers():
+    influx = FakeInflux()
+    cache = QueryCache(influx, grace=0, clock=lambda: 1000.0)
+    influx.points[990.5] = 1
+
+    influx.release.clear()
+    slow = threading.Thread(target=cache.query, args=(TEMPLATE,), kwargs={"start": 980, "every": 1})
+    slow.start()
+    assert influx.started.wait(5)
+
+    # The lock is free while the first query runs
+    cleared = threading.Thread(target=cache.clear)
+    cleared.start()
+    cleared.join(1)
+    assert not cleared.is_alive()
+
+    influx.release.set()
+    slow.join(5)
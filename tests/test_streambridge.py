@@ -0,0 +1,118 @@
+#  Copyright (C) 2025 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+"""Tests for the Redis stream to InfluxDB bridge, run against fakeredis."""
+
+import pytest
+
+from rrmsutils.heatmapschemagenerator import HeatmapSchemaGenerator
+from rrmsutils.models.engagementanalytics.detection import Frame
+from rrmsutils.models.heatmap import Blob, Heatmap
+from rrmsutils.models.point import Point2D
+from rrmsutils.utils import redisclient
+from rrmsutils.utils.payload import BINARY, encode_payload
+from rrmsutils.utils.redisclient import RedisClient
+from rrmsutils.utils.streambridge import FrameMapper, HeatmapMapper, StreamBridge
+
+fakeredis = pytest.importorskip("fakeredis")
+
+STREAM = "heatmap"
+
+
+class FakeInflux:
+    """Records the written lines, failing the given number of writes first"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.lines = []
+
+    def write_lines(self, lines, sync=False):
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.lines.extend(lines)
+        return True
+
+
+@pytest.fixture(name="redis_client")
+def fixture_redis_client(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    def fake_redis(*args, **kwargs):
+        kwargs.pop("host", None)
+        kwargs.pop("port", None)
+        return fakeredis.FakeRedis(*args, server=server, **kwargs)
+
+    monkeypatch.setattr(redisclient, "Redis", fake_redis)
+    return RedisClient(decode_responses=False)
+
+
+def heatmap(*xs):
+    return Heatmap(heatmap=[Blob(position=Point2D(x=x, y=0), intensity=0.5, radius=10) for x in xs])
+
+
+def pending(redis_client):
+    return redis_client._redis.xpending(STREAM, "influxdb-bridge")["pending"]  # pylint: disable=protected-access
+
+
+def test_failed_write_is_retried_from_pending_list(redis_client):
+    influx = FakeInflux(failures=2)
+    bridge = StreamBridge(redis_client, influx, {STREAM: (Heatmap, HeatmapMapper())}, block=1)
+    assert bridge.run_once() == 0
+
+    redis_client.write_to_stream(STREAM, encode_payload(heatmap(1, 2), BINARY))
+
+    assert bridge.run_once() == -1
+    assert bridge.run_once() == -1
+    assert pending(redis_client) == 1
+
+    assert bridge.run_once() == 1
+    assert len(influx.lines) == 2
+    assert pending(redis_client) == 0
+
+    # Once the pending list is drained the bridge goes back to new entries
+    assert bridge.run_once() == 0
+    redis_client.write_to_stream(STREAM, encode_payload(heatmap(3), BINARY))
+    assert bridge.run_once() == 1
+    assert len(influx.lines) == 3
+
+
+def test_delta_entries_are_rebuilt(redis_client):
+    influx = FakeInflux(failures=1)
+    bridge = StreamBridge(redis_client, influx, {STREAM: (Heatmap, HeatmapMapper())}, block=1)
+    assert bridge.run_once() == 0
+
+    generator = HeatmapSchemaGenerator(STREAM, delta=True, keyframe_interval=10)
+    generator.send(heatmap(1, 2))
+    generator.send(heatmap(1, 2, 300))
+    generator.close()
+
+    # The failed batch is applied again from the same base when it is retried
+    assert bridge.run_once() == -1
+    assert bridge.run_once() == 2
+    assert len(influx.lines) == 5
+    assert pending(redis_client) == 0
+
+
+def test_frame_points_are_unique_per_entry_and_detection():
+    frame = Frame.model_validate({
+        "id": 1, "cameraid": "cam0", "timestamp": "2025-01-01T00:00:00Z", "width": 1920, "height": 1080,
+        "detections": [
+            {"objectid": objectid, "position": {"x": 1, "y": 2, "z": 0}, "direction": {"x": 1, "y": 0, "z": 0}}
+            for objectid in ("a", "b")],
+    })
+    mapper = FrameMapper()
+
+    # Entries added in the same millisecond differ by their sequence number
+    lines = mapper(frame, "detection", b"1735689600000-0") + mapper(frame, "detection", b"1735689600000-1")
+    keys = {(line.split(" ")[0], line.split(" ")[2]) for line in lines}
+    assert len(keys) == 4
+    assert all(line.startswith("detection,cameraid=cam0,detection=") for line in lines)
+    assert 'objectid="a"' in lines[0]